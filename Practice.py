@@ -1,130 +1,17 @@
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
+from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
 
+# The domain classes live in scheduler_core; they are re-exported for code that imports them from here
+from scheduler_core import Main, Navigator, Schedule, TourScheduler, WEEKDAYS  # noqa: F401
+from scroll_view import VirtualScrollView, bind_mouse_wheel
+from view_rows import AvailabilityRows, TourCountRows, WeeklyTourRows
 
-class Navigator:
-    def __init__(self, name):
-        self.name = name
-        self.availability = {}
-        self.tour_count = 0
-        self.assigned_tours = set()
 
-    def add_availability(self, day, start_time, end_time):
-        if day not in self.availability:
-            self.availability[day] = []
-        self.availability[day].append((start_time, end_time))
-
-    def increment_tour_count(self):
-        self.tour_count += 1
-
-    def assign_tour(self, day, time):
-        self.assigned_tours.add((day, time))
-        self.increment_tour_count()
-
-    def is_assigned(self, day, time):
-        return (day, time) in self.assigned_tours
-
-    def display_availability(self):
-        return {day: [(start, end) for start, end in times] for day, times in self.availability.items()}
-
-    def display_tour_count(self):
-        return self.tour_count
-
-
-class Schedule:
-    def __init__(self):
-        self.navigators = []
-
-    def add_navigator(self, navigator):
-        self.navigators.append(navigator)
-
-    def display_all_availabilities(self):
-        return {navigator.name: navigator.display_availability() for navigator in self.navigators}
-
-
-class TourScheduler:
-    def __init__(self, schedule):
-        self.schedule = schedule
-        self.tours = {day: {"10:00 AM": None, "3:00 PM": None} for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
-        self.group_tours = {day: [] for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
-
-    def assign_tours(self):
-        import random
-
-        # Assign walk-in tours
-        for day, slots in self.tours.items():
-            for time, assigned in slots.items():
-                if assigned == "Pending":
-                    available_navigators = [
-                        navi for navi in self.schedule.navigators
-                        if self.is_available_for_one_hour(navi, day, time) and not navi.is_assigned(day, time)
-                    ]
-                    if available_navigators:
-                        # Shuffle for fairness, then pick the navigator with the fewest tours
-                        random.shuffle(available_navigators)
-                        assigned_navigator = min(available_navigators, key=lambda navi: navi.tour_count)
-                        self.tours[day][time] = assigned_navigator.name
-                        assigned_navigator.assign_tour(day, time)
-
-        # Assign group tours
-        for day, group_tours in self.group_tours.items():
-            for tour in group_tours:
-                available_navigators = [
-                    navi for navi in self.schedule.navigators
-                    if self.is_available_for_one_hour(navi, day, tour["time"]) and not navi.is_assigned(day, tour["time"])
-                ]
-                if available_navigators:
-                    # Shuffle and sort for fairness
-                    random.shuffle(available_navigators)
-                    assigned_navigators = []
-
-                    # Assign the first navigator
-                    primary_navigator = min(available_navigators, key=lambda navi: navi.tour_count)
-                    assigned_navigators.append(primary_navigator.name)
-                    primary_navigator.assign_tour(day, tour["time"])
-
-                    # Assign a second navigator if the group has more than 30 students
-                    if tour["students"] > 30 and len(available_navigators) > 1:
-                        available_navigators.remove(primary_navigator)  # Remove the already assigned navigator
-                        secondary_navigator = min(available_navigators, key=lambda navi: navi.tour_count)
-                        assigned_navigators.append(secondary_navigator.name)
-                        secondary_navigator.assign_tour(day, tour["time"])
-
-                    # Update the tour's assigned navigators
-                    tour["navigators"] = assigned_navigators
-
-    def is_available_for_one_hour(self, navigator, day, time):
-        """
-        Check if the navigator is available for the given time and one-hour duration.
-        """
-        if day not in navigator.availability:
-            return False
-
-        time_obj = datetime.strptime(time, "%I:%M %p")
-        one_hour_later = time_obj + timedelta(hours=1)
-
-        for start_time, end_time in navigator.availability[day]:
-            start = datetime.strptime(start_time, "%I:%M %p")
-            end = datetime.strptime(end_time, "%I:%M %p")
-            if start <= time_obj and one_hour_later <= end:
-                return True
-
-        return False
-
-
-class Main:
-    def __init__(self):
-        self.schedule = Schedule()
-        self.tour_scheduler = TourScheduler(self.schedule)
-
-    def add_navigator(self, name, availability):
-        navigator = Navigator(name)
-        for day, times in availability.items():
-            for start_time, end_time in times:
-                navigator.add_availability(day, start_time, end_time)
-        self.schedule.add_navigator(navigator)
+# How often the window checks on a background tour assignment
+POLL_MILLISECONDS = 100
 
 
 class TourSchedulerGUI:
@@ -132,11 +19,12 @@ class TourSchedulerGUI:
         self.root = root
         self.main = main
         self.root.title("Tour Scheduler")
+        self.assignment = None  # Cancel event of the assignment running in the background, if any
         self.setup_ui()
 
     def setup_ui(self):
         # Set a larger initial size and make the window resizable
-        self.root.geometry("600x550")
+        self.root.geometry("600x600")
         self.root.minsize(600, 400)
 
         # Main frame with Maroon background
@@ -176,6 +64,19 @@ class TourSchedulerGUI:
             command=self.change_schedule_window,  # Open change schedule window
         ).pack(pady=3)
 
+        ctk.CTkButton(
+            button_frame,
+            text="Import Roster",
+            width=button_width,
+            height=button_height,
+            corner_radius=20,
+            fg_color="#F5F5DC",
+            hover_color="#D3D3D3",
+            text_color="black",
+            font=button_font,
+            command=self.import_roster,
+        ).pack(pady=3)
+
         ctk.CTkButton(
             button_frame,
             text="View Availabilities",
@@ -254,6 +155,19 @@ class TourSchedulerGUI:
             command=self.view_tour_counts,
         ).pack(pady=3)
 
+        ctk.CTkButton(
+            button_frame,
+            text="Export Calendars",
+            width=button_width,
+            height=button_height,
+            corner_radius=20,
+            fg_color="#F5F5DC",
+            hover_color="#D3D3D3",
+            text_color="black",
+            font=button_font,
+            command=self.export_calendars,
+        ).pack(pady=3)
+
         # Footer
         footer_label = tk.Label(
             main_frame,
@@ -264,7 +178,44 @@ class TourSchedulerGUI:
         )
         footer_label.pack(side="bottom", pady=10)
 
+    def import_roster(self):
+        if self.assignment_running():
+            return
+        from roster_import import import_roster
+
+        path = filedialog.askopenfilename(
+            title="Import Roster",
+            filetypes=[("Roster files", "*.csv *.jsonl"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+
+        report = import_roster(self.main.schedule, path)
+        message = f"Imported {report.intervals} availability rows ({report.navigators_added} new navigators)."
+        if report.errors:
+            # Show the first few problems; the rest are summarized by count
+            shown = "\n".join(f"Line {line}: {error}" for line, error in report.errors[:10])
+            message += f"\n\n{len(report.errors)} row(s) were skipped:\n{shown}"
+            messagebox.showwarning("Import Roster", message)
+        else:
+            messagebox.showinfo("Success", message)
+
+    def export_calendars(self):
+        if self.assignment_running():
+            return
+        import schedule_export
+
+        directory = filedialog.askdirectory(title="Export Calendars")
+        if not directory:
+            return
+        with open(f"{directory}/tours.csv", "w", newline="") as file:
+            schedule_export.write_csv(self.main, file)
+        written = schedule_export.write_navigator_calendars(self.main, directory)
+        messagebox.showinfo("Success", f"Exported tours.csv and {written} navigator calendar(s).")
+
     def change_schedule_window(self):
+        if self.assignment_running():
+            return
         window = tk.Toplevel(self.root)
         window.title("Change Navigator Schedule")
         window.geometry("400x450")
@@ -288,7 +239,7 @@ class TourSchedulerGUI:
         tk.Label(frame_day, text="Select Day:", font=("Arial", 12)).pack(anchor="w")
         day_var = tk.StringVar()
         day_dropdown = ttk.Combobox(frame_day, textvariable=day_var,
-                                    values=["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"], state="readonly")
+                                    values=self.main.tour_scheduler.catalogue.days, state="readonly")
         day_dropdown.pack(fill="x", pady=5)
 
         # "Take Off" Checkbox
@@ -323,6 +274,8 @@ class TourSchedulerGUI:
 
         # Update Button
         def update_availability():
+            if self.assignment_running():
+                return
             navigator_name = navigator_var.get()
             day = day_var.get()
             take_off = take_off_var.get()
@@ -333,25 +286,37 @@ class TourSchedulerGUI:
                 messagebox.showerror("Error", "Please select a navigator and a day.")
                 return
 
-            for navigator in self.main.schedule.navigators:
-                if navigator.name == navigator_name:
-                    if take_off:
-                        navigator.availability[day] = []
-                        messagebox.showinfo("Success", f"{navigator_name} is marked as unavailable on {day}.")
-                    else:
-                        if not start_time or not end_time:
-                            messagebox.showerror("Error", "Please provide valid start and end times.")
-                            return
-                        navigator.availability[day] = [(start_time, end_time)]
-                        messagebox.showinfo("Success",
-                                            f"{navigator_name}'s availability updated for {day}:\n{start_time} - {end_time}")
-                    break
+            scheduler = self.main.tour_scheduler
+            navigator = self.main.schedule.get_navigator(navigator_name)
+            if navigator is not None:
+                if take_off:
+                    released = scheduler.update_availability(navigator, day, [])
+                    message = f"{navigator_name} is marked as unavailable on {day}."
+                else:
+                    if not start_time or not end_time:
+                        messagebox.showerror("Error", "Please provide valid start and end times.")
+                        return
+                    try:
+                        released = scheduler.update_availability(
+                            navigator, day, [(start_time.strip(), end_time.strip())]
+                        )
+                    except ValueError:
+                        messagebox.showerror("Error", "Please provide valid start and end times.")
+                        return
+                    message = f"{navigator_name}'s availability updated for {day}:\n{start_time} - {end_time}"
+
+                # Only the tours this change invalidated were re-staffed
+                if released:
+                    message += f"\n{len(released)} tour(s) on {day} were released and re-staffed where possible."
+                messagebox.showinfo("Success", message)
 
             window.destroy()
 
         tk.Button(window, text="Update Schedule", font=("Arial", 12), command=update_availability).pack(pady=20)
 
     def add_navigator_window(self):
+        if self.assignment_running():
+            return
         window = tk.Toplevel(self.root)
         window.title("Add Navigator")
 
@@ -364,12 +329,17 @@ class TourSchedulerGUI:
         availability_entry.grid(row=1, column=1, padx=5, pady=5)
 
         def add_navigator():
+            if self.assignment_running():
+                return
             name = name_entry.get().strip()
             availability_str = availability_entry.get().strip()
 
             if not name or not availability_str:
                 messagebox.showerror("Error", "All fields are required!")
                 return
+            if self.main.schedule.get_navigator(name) is not None:
+                messagebox.showerror("Error", f"Navigator '{name}' already exists!")
+                return
 
             availability = {}
             try:
@@ -378,11 +348,11 @@ class TourSchedulerGUI:
                     if day not in availability:
                         availability[day] = []
                     availability[day].append((start.strip(), end.strip()))
+                self.main.add_navigator(name, availability)
             except ValueError:
                 messagebox.showerror("Error", "Invalid availability format!")
                 return
 
-            self.main.add_navigator(name, availability)
             messagebox.showinfo("Success", f"Navigator '{name}' added successfully!")
             window.destroy()
 
@@ -401,74 +371,33 @@ class TourSchedulerGUI:
             pady=10
         ).pack()
 
-        # Scrollable Text Area
-        text_frame = tk.Frame(window)
-        text_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-        canvas = tk.Canvas(text_frame)
-        scrollbar = tk.Scrollbar(text_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Bind mouse wheel scrolling
-        def on_mouse_wheel(event):
-            canvas.yview_scroll(-1 * int(event.delta / 120), "units")
-
-        # Bind to both canvas and frame for cross-platform compatibility
-        canvas.bind_all("<MouseWheel>", on_mouse_wheel)  # For Windows and Linux
-        canvas.bind_all("<Button-4>", on_mouse_wheel)  # For Linux (alternative scroll up)
-        canvas.bind_all("<Button-5>", on_mouse_wheel)  # For Linux (alternative scroll down)
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        # Display navigator availabilities
-        availabilities = self.main.schedule.display_all_availabilities()
-        for name, days in availabilities.items():
-            # Navigator Name
-            navigator_label = tk.Label(
-                scrollable_frame,
-                text=f"{name}:",
-                font=("Arial", 14, "bold"),
-                anchor="w",
-                justify="left"
-            )
-            navigator_label.pack(fill="x", pady=(10, 0))  # Add spacing above each navigator's name
-
-            # Day and Time
-            for day, times in days.items():
-                times_text = ", ".join([f"{start} to {end}" for start, end in times]) if times else "Unavailable"
-                day_label = tk.Label(
-                    scrollable_frame,
-                    text=f"  {day}: {times_text}",
-                    font=("Arial", 12),
-                    anchor="w",
-                    justify="left"
-                )
-                day_label.pack(fill="x", padx=10)  # Add indentation for the days
+        # Only the visible rows are rendered, so this opens instantly for any roster size
+        rows = AvailabilityRows(self.main.schedule, self.main.tour_scheduler.catalogue.days)
+        VirtualScrollView(
+            window,
+            row_count=rows.row_count,
+            render_row=rows.render_row,
+            styles={"name": {"font": ("Arial", 14, "bold"), "padx": 0}, "day": {"font": ("Arial", 12), "padx": 10}},
+        ).pack(fill="both", expand=True, padx=10, pady=10)
 
     def input_walk_in_tours_window(self):
+        if self.assignment_running():
+            return
         window = tk.Toplevel(self.root)
         window.title("Input Walk-In Tours")
 
         tk.Label(window, text="Input Walk-In Tours for Each Day", font=("Arial", 14, "bold")).pack(pady=10)
 
         tour_inputs = {}
-        for day in self.main.tour_scheduler.tours:
+        scheduler = self.main.tour_scheduler
+        for day in scheduler.days:
             day_frame = tk.Frame(window, pady=5)
             day_frame.pack(fill="x", padx=10)
 
             tk.Label(day_frame, text=f"{day}:", font=("Arial", 12)).pack(side="left", padx=5)
             tour_inputs[day] = {}
 
-            for time in self.main.tour_scheduler.tours[day]:
+            for time in [tour.time for tour in scheduler.walk_in_tours(day)]:
                 time_frame = tk.Frame(day_frame, padx=5)
                 time_frame.pack(side="left")
 
@@ -479,13 +408,15 @@ class TourSchedulerGUI:
                 tour_inputs[day][time] = combo
 
         def save_walk_in_tours():
+            if self.assignment_running():
+                return
             for day, times in tour_inputs.items():
                 for time, combo in times.items():
                     user_input = combo.get().strip().lower()
                     if user_input == "yes":
-                        self.main.tour_scheduler.tours[day][time] = "Pending"
+                        scheduler.request_walk_in(day, time)
                     elif user_input == "no":
-                        self.main.tour_scheduler.tours[day][time] = None
+                        scheduler.request_walk_in(day, time, requested=False)
                     else:
                         messagebox.showerror("Error", f"Invalid input for {day} at {time}")
                         return
@@ -496,6 +427,8 @@ class TourSchedulerGUI:
         tk.Button(window, text="Save Walk-In Tours", command=save_walk_in_tours).pack(pady=10)
 
     def input_group_tours_window(self):
+        if self.assignment_running():
+            return
         window = tk.Toplevel(self.root)
         window.title("Input Group Tours")
         window.geometry("600x500")  # Set a reasonable window size
@@ -524,21 +457,15 @@ class TourSchedulerGUI:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
-        # Bind mouse wheel scrolling
-        def on_mouse_wheel(event):
-            canvas.yview_scroll(-1 * int(event.delta / 120), "units")
-
-        # Bind for cross-platform compatibility
-        canvas.bind_all("<MouseWheel>", on_mouse_wheel)  # For Windows and Linux
-        canvas.bind_all("<Button-4>", on_mouse_wheel)  # Alternative scroll up for Linux
-        canvas.bind_all("<Button-5>", on_mouse_wheel)  # Alternative scroll down for Linux
+        # Bind mouse wheel scrolling; the binding is removed again when the window closes
+        bind_mouse_wheel(window, canvas)
 
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
         # Add group tour input fields for each day
         group_tour_inputs = {}
-        for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]:
+        for day in self.main.tour_scheduler.catalogue.days:
             day_frame = tk.Frame(scrollable_frame, pady=10)
             day_frame.pack(fill="both", padx=10)
 
@@ -580,40 +507,164 @@ class TourSchedulerGUI:
                 students_entry = tk.Entry(group_frame, width=30)
                 students_entry.grid(row=3, column=1, padx=5, pady=2)
 
+                # Suggest start times the roster can still staff, best first
+                suggestion_label = tk.Label(group_frame, text="", justify="left", wraplength=300)
+                suggestion_label.grid(row=4, column=1, sticky="w", padx=5, pady=2)
+                tk.Button(
+                    group_frame,
+                    text="Suggest Times",
+                    command=lambda d=day, t=time_entry, n=students_entry, label=suggestion_label:
+                        self.suggest_group_times(d, t, n, label),
+                ).grid(row=4, column=0, sticky="w", padx=5, pady=2)
+
                 group_tour_inputs[day].append((school_entry, time_entry, students_entry))
 
         # Save Button
         def save_group_tours():
+            if self.assignment_running():
+                return
+            # The whole form is checked in one pass and saved only if every filled-in tour is valid
+            bookings = []
+            places = []
             for day, tours in group_tour_inputs.items():
-                for school_entry, time_entry, students_entry in tours:
-                    school = school_entry.get().strip()
-                    time = time_entry.get().strip()
-                    students = students_entry.get().strip()
-
-                    if school and time and students.isdigit():
-                        self.main.tour_scheduler.group_tours[day].append({
-                            "school": school,
-                            "time": time,
-                            "students": int(students),
-                            "navigators": []  # Assigned later
-                        })
-                    elif school or time or students:  # Partial input
-                        messagebox.showerror("Error", f"Invalid data for group tour on {day}")
-                        return
+                for number, (school_entry, time_entry, students_entry) in enumerate(tours, start=1):
+                    booking = {"day": day, "school": school_entry.get(), "time": time_entry.get(),
+                               "students": students_entry.get().strip()}
+                    if booking["school"].strip() or booking["time"].strip() or booking["students"]:
+                        bookings.append(booking)
+                        places.append(f"{day} group tour {number}")
+
+            report = self.main.tour_scheduler.add_group_tours(bookings, strict=True)
+            if report.errors:
+                shown = "\n".join(f"{places[position]}: {error}" for position, error in report.errors)
+                messagebox.showerror("Error", f"No group tours were saved:\n{shown}")
+                return
 
             messagebox.showinfo("Success", "Group Tours saved successfully!")
             window.destroy()
 
+        buttons = tk.Frame(window)
+        buttons.pack(pady=10)
         tk.Button(
-            window,
+            buttons,
             text="Save Group Tours",
             font=("Arial", 12),
             command=save_group_tours
-        ).pack(pady=10)
+        ).pack(side="left", padx=5)
+        # Files can book any number of group tours per day, beyond the two the form has room for
+        tk.Button(
+            buttons,
+            text="Load Bookings File...",
+            font=("Arial", 12),
+            command=lambda: self.import_bookings(window)
+        ).pack(side="left", padx=5)
+
+    def import_bookings(self, window=None):
+        if self.assignment_running():
+            return
+        from booking_import import import_bookings
+
+        path = filedialog.askopenfilename(
+            title="Load Bookings",
+            filetypes=[("Booking files", "*.csv *.jsonl *.json"), ("All files", "*.*")],
+            parent=window,
+        )
+        if not path:
+            return
+
+        report = import_bookings(self.main.tour_scheduler, path)
+        message = f"Added {len(report.added)} group tours."
+        if report.errors:
+            # Show the first few problems; the rest are summarized by count
+            shown = "\n".join(f"Line {line}: {error}" for line, error in report.errors[:10])
+            message += f"\n\n{len(report.errors)} booking(s) were skipped:\n{shown}"
+            messagebox.showwarning("Load Bookings", message, parent=window)
+        else:
+            messagebox.showinfo("Success", message, parent=window)
+
+    def suggest_group_times(self, day, time_entry, students_entry, label):
+        # The first suggestion builds the coverage profile, which must not race the copy being solved
+        if self.assignment_running():
+            return
+        scheduler = self.main.tour_scheduler
+        students = students_entry.get().strip()
+        needed = scheduler.policy.navigators_for(int(students)) if students.isdigit() else 1
+        options = scheduler.recommend_times(day, needed)[:5]
+        if not options:
+            label.configure(text=f"No start time on {day} has {needed} free navigator(s).")
+            return
+        label.configure(text="Best: " + ", ".join(f"{time} ({slack} spare)" for time, free, slack in options))
+        if not time_entry.get().strip():
+            time_entry.insert(0, options[0][0])
+
+    def assignment_running(self):
+        # Edits made while the week is copied and solved would race the copy or be lost when it is swapped in
+        if self.assignment is not None:
+            messagebox.showinfo("Please Wait", "Tours are being assigned. Try again once that has finished.")
+            return True
+        return False
 
     def assign_tours(self):
-        self.main.tour_scheduler.assign_tours()
-        messagebox.showinfo("Success", "Tours assigned successfully!")
+        if self.assignment_running():
+            return
+
+        # The week is copied and solved in a worker thread; the Tk thread polls for its progress
+        # and swaps the copy in only once it has finished, so the window stays usable meanwhile.
+        # Copying a large roster takes far longer than the greedy solve, so it must not run here
+        cancel = threading.Event()
+        events = queue.Queue()
+        self.assignment = cancel
+
+        window = tk.Toplevel(self.root)
+        window.title("Assigning Tours")
+        status = tk.Label(window, text="Assigning tours...", font=("Arial", 12))
+        status.pack(padx=20, pady=(20, 5))
+        progress_bar = ttk.Progressbar(window, length=300, mode="determinate")
+        progress_bar.pack(padx=20, pady=5)
+        cancel_button = tk.Button(window, text="Cancel", command=cancel.set)
+        cancel_button.pack(pady=(5, 20))
+        window.protocol("WM_DELETE_WINDOW", cancel.set)
+
+        def run():
+            try:
+                events.put(("copying",))
+                week = self.main.copy()
+                finished = week.tour_scheduler.assign_tours(
+                    progress=lambda done, total: events.put(("progress", done, total)), cancel=cancel
+                )
+                events.put(("finished", finished, week))
+            except Exception as error:  # Reported on the Tk thread
+                events.put(("failed", error))
+
+        def poll():
+            while True:
+                try:
+                    event = events.get_nowait()
+                except queue.Empty:
+                    break
+                if event[0] == "copying":
+                    status.configure(text="Copying the week...")
+                    continue
+                if event[0] == "progress":
+                    _, done, total = event
+                    progress_bar.configure(maximum=total, value=done)
+                    status.configure(text=f"Assigning tours... {done} of {total}")
+                    continue
+
+                self.assignment = None
+                window.destroy()
+                if event[0] == "failed":
+                    messagebox.showerror("Error", f"Assigning tours failed: {event[1]}")
+                elif event[1]:
+                    self.main.replace_with(event[2])
+                    messagebox.showinfo("Success", "Tours assigned successfully!")
+                else:
+                    messagebox.showinfo("Cancelled", "Tour assignment was cancelled; nothing was changed.")
+                return
+            self.root.after(POLL_MILLISECONDS, poll)
+
+        threading.Thread(target=run, daemon=True).start()
+        self.root.after(POLL_MILLISECONDS, poll)
 
     def view_weekly_tours(self):
         window = tk.Toplevel(self.root)
@@ -628,84 +679,14 @@ class TourSchedulerGUI:
             pady=10
         ).pack()
 
-        # Scrollable Frame Setup
-        frame_container = tk.Frame(window)
-        frame_container.pack(fill="both", expand=True, padx=10, pady=10)
-
-        canvas = tk.Canvas(frame_container)
-        scrollbar = tk.Scrollbar(frame_container, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Bind mouse wheel scrolling
-        def on_mouse_wheel(event):
-            canvas.yview_scroll(-1 * int(event.delta / 120), "units")
-
-        # Bind for cross-platform compatibility
-        canvas.bind_all("<MouseWheel>", on_mouse_wheel)  # For Windows and Linux
-        canvas.bind_all("<Button-4>", on_mouse_wheel)  # Alternative scroll up for Linux
-        canvas.bind_all("<Button-5>", on_mouse_wheel)  # Alternative scroll down for Linux
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        # Display weekly tours
-        weekly_tours = self.main.tour_scheduler.tours
-        group_tours = self.main.tour_scheduler.group_tours
-
-        for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]:
-            # Day Header
-            day_label = tk.Label(
-                scrollable_frame,
-                text=f"{day}:",
-                font=("Arial", 14, "bold"),
-                pady=5
-            )
-            day_label.pack(anchor="w")
-
-            # Collect all tours for the day (walk-in and group tours)
-            daily_tours = []
-
-            # Add walk-in tours
-            for time, navigator in weekly_tours[day].items():
-                if navigator:
-                    daily_tours.append((time, f"{time}: {navigator}"))
-                else:
-                    daily_tours.append((time, f"{time}: Unassigned"))
-
-            # Add group tours
-            for group in group_tours[day]:
-                navigators = ", ".join(group["navigators"]) if group["navigators"] else "Unassigned"
-                daily_tours.append((group["time"],
-                                    f"{group['time']}: {group['school']} with {group['students']} students (Navigators: {navigators})"))
-
-            # Sort all tours by time
-            daily_tours.sort(key=lambda x: datetime.strptime(x[0], "%I:%M %p"))
-
-            # Display sorted tours
-            for _, description in daily_tours:
-                tour_label = tk.Label(
-                    scrollable_frame,
-                    text=f"    {description}",
-                    font=("Arial", 12),
-                    anchor="w",
-                    justify="left"
-                )
-                tour_label.pack(anchor="w", padx=20)  # Indented for clarity
-
-            # Add spacing between days
-            tk.Label(scrollable_frame, text="").pack()  # Blank line for spacing
-
-        # Make text read-only
-        def disable_scrolling(event):
-            pass  # No text area to disable here, just for compatibility if needed.
+        # Display weekly tours; each day's tours are kept sorted, so rows are built only as they scroll into view
+        rows = WeeklyTourRows(self.main.tour_scheduler)
+        VirtualScrollView(
+            window,
+            row_count=rows.row_count,
+            render_row=rows.render_row,
+            styles={"day": {"font": ("Arial", 14, "bold"), "padx": 0}, "tour": {"font": ("Arial", 12), "padx": 20}},
+        ).pack(fill="both", expand=True, padx=10, pady=10)
 
     def view_tour_counts(self):
         window = tk.Toplevel(self.root)
@@ -720,71 +701,82 @@ class TourSchedulerGUI:
             pady=10
         ).pack()
 
-        # Add a frame to display tour counts
-        count_frame = tk.Frame(window, padx=10, pady=10)
-        count_frame.pack(fill="both", expand=True)
-
-        # Display navigator tour counts
-        for navigator in self.main.schedule.navigators:
-            count_label = tk.Label(
-                count_frame,
-                text=f"{navigator.name}: {navigator.tour_count} tours assigned",
-                font=("Arial", 12),
-                anchor="w",
-                pady=5
-            )
-            count_label.pack(anchor="w", padx=10)  # Indented for clarity
-
+        # Display navigator tour counts, rendering only the visible rows
+        rows = TourCountRows(self.main.schedule)
+        VirtualScrollView(
+            window,
+            row_count=rows.row_count,
+            render_row=rows.render_row,
+            styles={"count": {"font": ("Arial", 12), "padx": 10}},
+        ).pack(fill="both", expand=True, padx=10, pady=10)
 
 if __name__ == "__main__":
-    main = Main()
-
-    # Add some sample navigators
-    main.add_navigator("Sanaa", {
-        "Monday": [("9:00 AM", "5:00 PM")],
-        "Tuesday": [("9:00 AM", "12:00 PM")],
-        "Wednesday": [("3:00 PM", "5:00 PM")],
-        "Thursday": [("9:00 AM", "5:00 PM")]
-    })
-
-    main.add_navigator("Damir", {
-        "Wednesday": [("9:00 AM", "5:00 PM")],
-        "Thursday": [("9:00 AM", "12:00 PM")],
-        "Friday": [("9:00 AM", "5:00 PM")]
-    })
-
-    main.add_navigator("Emily", {
-        "Monday": [("9:00 AM", "12:00 PM")],
-        "Wednesday": [("9:00 AM", "5:00 PM")],
-        "Friday": [("9:00 AM", "5:00 PM")]
-    })
-
-    main.add_navigator("Tanim", {
-        "Thursday": [("9:00 AM", "5:00 PM")],
-        "Friday": [("9:00 AM", "5:00 PM")]
-    })
-
-    main.add_navigator("Donara", {
-        "Monday": [("10:30 AM", "5:00 PM")],
-        "Wednesday": [("10:00 AM", "5:00 PM")]
-    })
-
-    main.add_navigator("Mousa", {
-        "Monday": [("9:00 AM", "11:00 AM")],
-        "Tuesday": [("9:00 AM", "11:00 AM")],
-        "Wednesday": [("9:00 AM", "11:00 AM")],
-        "Thursday": [("9:00 AM", "11:00 AM")]
-    })
-
-    main.add_navigator("Dior", {
-        "Tuesday": [("9:30 AM", "3:00 PM")],
-        "Friday": [("10:00 AM", "3:00 PM")]
-    })
-
-    main.add_navigator("Mike", {
-        "Tuesday": [("12:00 PM", "5:00 PM")]
-    })
+    import sys
+
+    store = None
+    if len(sys.argv) > 1:
+        # Open a saved week instead of the sample roster; it is saved back when the window closes
+        from schedule_store import ScheduleStore
+
+        store = ScheduleStore(sys.argv[1])
+        main = store.load()
+    else:
+        main = Main()
+
+        # Add some sample navigators
+        main.add_navigator("Sanaa", {
+            "Monday": [("9:00 AM", "5:00 PM")],
+            "Tuesday": [("9:00 AM", "12:00 PM")],
+            "Wednesday": [("3:00 PM", "5:00 PM")],
+            "Thursday": [("9:00 AM", "5:00 PM")]
+        })
+
+        main.add_navigator("Damir", {
+            "Wednesday": [("9:00 AM", "5:00 PM")],
+            "Thursday": [("9:00 AM", "12:00 PM")],
+            "Friday": [("9:00 AM", "5:00 PM")]
+        })
+
+        main.add_navigator("Emily", {
+            "Monday": [("9:00 AM", "12:00 PM")],
+            "Wednesday": [("9:00 AM", "5:00 PM")],
+            "Friday": [("9:00 AM", "5:00 PM")]
+        })
+
+        main.add_navigator("Tanim", {
+            "Thursday": [("9:00 AM", "5:00 PM")],
+            "Friday": [("9:00 AM", "5:00 PM")]
+        })
+
+        main.add_navigator("Donara", {
+            "Monday": [("10:30 AM", "5:00 PM")],
+            "Wednesday": [("10:00 AM", "5:00 PM")]
+        })
+
+        main.add_navigator("Mousa", {
+            "Monday": [("9:00 AM", "11:00 AM")],
+            "Tuesday": [("9:00 AM", "11:00 AM")],
+            "Wednesday": [("9:00 AM", "11:00 AM")],
+            "Thursday": [("9:00 AM", "11:00 AM")]
+        })
+
+        main.add_navigator("Dior", {
+            "Tuesday": [("9:30 AM", "3:00 PM")],
+            "Friday": [("10:00 AM", "3:00 PM")]
+        })
+
+        main.add_navigator("Mike", {
+            "Tuesday": [("12:00 PM", "5:00 PM")]
+        })
 
     root = tk.Tk()
     app = TourSchedulerGUI(root, main)
+
+    if store is not None:
+        def save_and_close():
+            store.save(main)
+            store.close()
+            root.destroy()
+
+        root.protocol("WM_DELETE_WINDOW", save_and_close)
     root.mainloop()
@@ -1,130 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
 import customtkinter as ctk
 
-
-class Navigator:
-    def __init__(self, name):
-        self.name = name
-        self.availability = {}
-        self.tour_count = 0
-        self.assigned_tours = set()
-
-    def add_availability(self, day, start_time, end_time):
-        if day not in self.availability:
-            self.availability[day] = []
-        self.availability[day].append((start_time, end_time))
-
-    def increment_tour_count(self):
-        self.tour_count += 1
-
-    def assign_tour(self, day, time):
-        self.assigned_tours.add((day, time))
-        self.increment_tour_count()
-
-    def is_assigned(self, day, time):
-        return (day, time) in self.assigned_tours
-
-    def display_availability(self):
-        return {day: [(start, end) for start, end in times] for day, times in self.availability.items()}
-
-    def display_tour_count(self):
-        return self.tour_count
-
-
-class Schedule:
-    def __init__(self):
-        self.navigators = []
-
-    def add_navigator(self, navigator):
-        self.navigators.append(navigator)
-
-    def display_all_availabilities(self):
-        return {navigator.name: navigator.display_availability() for navigator in self.navigators}
-
-
-class TourScheduler:
-    def __init__(self, schedule):
-        self.schedule = schedule
-        self.tours = {day: {"10:00 AM": None, "3:00 PM": None} for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
-        self.group_tours = {day: [] for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
-
-    def assign_tours(self):
-        import random
-
-        # Assign walk-in tours
-        for day, slots in self.tours.items():
-            for time, assigned in slots.items():
-                if assigned == "Pending":
-                    available_navigators = [
-                        navi for navi in self.schedule.navigators
-                        if self.is_available_for_one_hour(navi, day, time) and not navi.is_assigned(day, time)
-                    ]
-                    if available_navigators:
-                        # Shuffle for fairness, then pick the navigator with the fewest tours
-                        random.shuffle(available_navigators)
-                        assigned_navigator = min(available_navigators, key=lambda navi: navi.tour_count)
-                        self.tours[day][time] = assigned_navigator.name
-                        assigned_navigator.assign_tour(day, time)
-
-        # Assign group tours
-        for day, group_tours in self.group_tours.items():
-            for tour in group_tours:
-                available_navigators = [
-                    navi for navi in self.schedule.navigators
-                    if self.is_available_for_one_hour(navi, day, tour["time"]) and not navi.is_assigned(day, tour["time"])
-                ]
-                if available_navigators:
-                    # Shuffle and sort for fairness
-                    random.shuffle(available_navigators)
-                    assigned_navigators = []
-
-                    # Assign the first navigator
-                    primary_navigator = min(available_navigators, key=lambda navi: navi.tour_count)
-                    assigned_navigators.append(primary_navigator.name)
-                    primary_navigator.assign_tour(day, tour["time"])
-
-                    # Assign a second navigator if the group has more than 30 students
-                    if tour["students"] > 30 and len(available_navigators) > 1:
-                        available_navigators.remove(primary_navigator)  # Remove the already assigned navigator
-                        secondary_navigator = min(available_navigators, key=lambda navi: navi.tour_count)
-                        assigned_navigators.append(secondary_navigator.name)
-                        secondary_navigator.assign_tour(day, tour["time"])
-
-                    # Update the tour's assigned navigators
-                    tour["navigators"] = assigned_navigators
-
-    def is_available_for_one_hour(self, navigator, day, time):
-        """
-        Check if the navigator is available for the given time and one-hour duration.
-        """
-        if day not in navigator.availability:
-            return False
-
-        time_obj = datetime.strptime(time, "%I:%M %p")
-        one_hour_later = time_obj + timedelta(hours=1)
-
-        for start_time, end_time in navigator.availability[day]:
-            start = datetime.strptime(start_time, "%I:%M %p")
-            end = datetime.strptime(end_time, "%I:%M %p")
-            if start <= time_obj and one_hour_later <= end:
-                return True
-
-        return False
-
-
-class Main:
-    def __init__(self):
-        self.schedule = Schedule()
-        self.tour_scheduler = TourScheduler(self.schedule)
-
-    def add_navigator(self, name, availability):
-        navigator = Navigator(name)
-        for day, times in availability.items():
-            for start_time, end_time in times:
-                navigator.add_availability(day, start_time, end_time)
-        self.schedule.add_navigator(navigator)
+# The domain classes live in scheduler_core; they are re-exported for code that imports them from here
+from scheduler_core import Main, Navigator, Schedule, TourScheduler, WEEKDAYS  # noqa: F401
+from view_rows import describe_tour
 
 
 class TourSchedulerGUI:
@@ -281,6 +161,9 @@ class TourSchedulerGUI:
             if not name or not availability_str:
                 messagebox.showerror("Error", "All fields are required!")
                 return
+            if self.main.schedule.get_navigator(name) is not None:
+                messagebox.showerror("Error", f"Navigator '{name}' already exists!")
+                return
 
             availability = {}
             try:
@@ -289,11 +172,11 @@ class TourSchedulerGUI:
                     if day not in availability:
                         availability[day] = []
                     availability[day].append((start.strip(), end.strip()))
+                self.main.add_navigator(name, availability)
             except ValueError:
                 messagebox.showerror("Error", "Invalid availability format!")
                 return
 
-            self.main.add_navigator(name, availability)
             messagebox.showinfo("Success", f"Navigator '{name}' added successfully!")
             window.destroy()
 
@@ -321,14 +204,15 @@ class TourSchedulerGUI:
         tk.Label(window, text="Input Walk-In Tours for Each Day", font=("Arial", 14, "bold")).pack(pady=10)
 
         tour_inputs = {}
-        for day in self.main.tour_scheduler.tours:
+        scheduler = self.main.tour_scheduler
+        for day in scheduler.days:
             day_frame = tk.Frame(window, pady=5)
             day_frame.pack(fill="x", padx=10)
 
             tk.Label(day_frame, text=f"{day}:", font=("Arial", 12)).pack(side="left", padx=5)
             tour_inputs[day] = {}
 
-            for time in self.main.tour_scheduler.tours[day]:
+            for time in [tour.time for tour in scheduler.walk_in_tours(day)]:
                 time_frame = tk.Frame(day_frame, padx=5)
                 time_frame.pack(side="left")
 
@@ -343,9 +227,9 @@ class TourSchedulerGUI:
                 for time, combo in times.items():
                     user_input = combo.get().strip().lower()
                     if user_input == "yes":
-                        self.main.tour_scheduler.tours[day][time] = "Pending"
+                        scheduler.request_walk_in(day, time)
                     elif user_input == "no":
-                        self.main.tour_scheduler.tours[day][time] = None
+                        scheduler.request_walk_in(day, time, requested=False)
                     else:
                         messagebox.showerror("Error", f"Invalid input for {day} at {time}")
                         return
@@ -376,7 +260,7 @@ class TourSchedulerGUI:
         canvas.pack(side="left", fill="both", expand=True)
         scroll_y.pack(side="right", fill="y")
 
-        for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]:
+        for day in self.main.tour_scheduler.catalogue.days:
             day_frame = tk.Frame(frame, pady=10)
             day_frame.pack(fill="both", padx=10)
 
@@ -413,12 +297,11 @@ class TourSchedulerGUI:
                     students = students_entry.get().strip()
 
                     if school and time and students.isdigit():
-                        self.main.tour_scheduler.group_tours[day].append({
-                            "school": school,
-                            "time": time,
-                            "students": int(students),
-                            "navigators": []  # Assigned later
-                        })
+                        try:
+                            self.main.tour_scheduler.add_group_tour(day, school, time, students)
+                        except ValueError:
+                            messagebox.showerror("Error", f"Invalid time {time!r} for group tour on {day}")
+                            return
                     elif school or time or students:  # Partial input
                         messagebox.showerror("Error", f"Invalid data for group tour on {day}")
                         return
@@ -439,34 +322,14 @@ class TourSchedulerGUI:
         text_area = tk.Text(window, wrap="word", width=80, height=30)
         text_area.pack(fill="both", expand=True, padx=10, pady=10)
 
-        weekly_tours = self.main.tour_scheduler.tours
-        group_tours = self.main.tour_scheduler.group_tours
+        days = self.main.tour_scheduler.days
 
-        for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]:
+        for day in days:
             text_area.insert("end", f"{day}:\n")
 
-            # Collect all tours for the day (walk-in and group tours)
-            daily_tours = []
-
-            # Add walk-in tours
-            for time, navigator in weekly_tours[day].items():
-                if navigator:
-                    daily_tours.append((time, f"{time}: {navigator}"))
-                else:
-                    daily_tours.append((time, f"{time}: Unassigned"))
-
-            # Add group tours
-            for group in group_tours[day]:
-                navigators = ", ".join(group["navigators"]) if group["navigators"] else "Unassigned"
-                daily_tours.append((group["time"],
-                                    f"{group['time']}: {group['school']} with {group['students']} students (Navigators: {navigators})"))
-
-            # Sort all tours by time
-            daily_tours.sort(key=lambda x: datetime.strptime(x[0], "%I:%M %p"))
-
-            # Display sorted tours
-            for _, description in daily_tours:
-                text_area.insert("end", f"    {description}\n")
+            # Tours are kept sorted by start time, walk-ins first
+            for tour in days[day]:
+                text_area.insert("end", f"    {describe_tour(tour)}\n")
 
             # Add a blank line for spacing between days
             text_area.insert("end", "\n")
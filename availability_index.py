@@ -0,0 +1,114 @@
+import numpy as np
+
+
+BUCKET_MINUTES = 5
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+WORDS_PER_DAY = (BUCKETS_PER_DAY + 63) // 64
+WORD_MASK = (1 << 64) - 1
+
+
+def bucket_mask(first, last):
+    """
+    Bit mask with buckets [first, last) set, as a Python int.
+    """
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def split_words(mask):
+    return [(mask >> (64 * word)) & WORD_MASK for word in range(WORDS_PER_DAY)]
+
+
+class AvailabilityIndex:
+    """
+    Roster-wide bitmap of navigators x days x 5-minute buckets.
+
+    Each (navigator, day) row is stored bit-packed in uint64 words. A bucket is set in
+    `available` only when one availability interval covers all of it, and a bucket is set
+    in `booked` when any booked tour touches it. For a window on the 5-minute grid both are
+    exact, and a query is a handful of vectorized AND/compare operations over the whole
+    roster instead of a per-navigator interval scan.
+    """
+
+    def __init__(self, days, capacity=64):
+        self.days = list(days)
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        self.size = 0
+        self.available = np.zeros((capacity, len(self.days), WORDS_PER_DAY), dtype=np.uint64)
+        self.booked = np.zeros_like(self.available)
+
+    @classmethod
+    def for_schedule(cls, schedule, days):
+        index = cls(days, capacity=max(64, len(schedule.navigators)))
+        for navigator in schedule.navigators:
+            index.navigator_added(navigator)
+        schedule.add_listener(index)
+        return index
+
+    def grow(self, size):
+        capacity = self.available.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        extra = capacity - self.available.shape[0]
+        padding = np.zeros((extra, len(self.days), WORDS_PER_DAY), dtype=np.uint64)
+        self.available = np.concatenate([self.available, padding])
+        self.booked = np.concatenate([self.booked, padding])
+
+    def navigator_added(self, navigator):
+        self.grow(navigator.id + 1)
+        self.size = max(self.size, navigator.id + 1)
+        for day in self.days:
+            self.refresh(navigator, day)
+
+    def navigator_changed(self, navigator, day, window=None):
+        if day in self.day_index:
+            self.refresh(navigator, day)
+
+    def refresh(self, navigator, day):
+        """
+        Rebuild one navigator's row for one day from its intervals and assigned tours.
+        """
+        d = self.day_index[day]
+        available = 0
+        for start, end in zip(*navigator.day_intervals(day)):
+            # Only buckets the interval covers completely count as available
+            first = -(-start // BUCKET_MINUTES)
+            last = end // BUCKET_MINUTES
+            available |= bucket_mask(first, last)
+
+        booked = 0
+        for start, end in zip(*navigator.day_bookings(day)):
+            # Every bucket the tour touches is taken, so grid windows overlapping it are excluded
+            booked |= bucket_mask(start // BUCKET_MINUTES, -(-end // BUCKET_MINUTES))
+
+        self.available[navigator.id, d] = split_words(available)
+        self.booked[navigator.id, d] = split_words(booked)
+
+    def free_for(self, day, start, duration):
+        """
+        Ids of navigators available for [start, start + duration) with no booked tour overlapping it.
+
+        Returns None when the window is off the 5-minute grid or the day is not indexed, so the
+        caller can fall back to an exact per-navigator check.
+        """
+        if day not in self.day_index or start % BUCKET_MINUTES or duration % BUCKET_MINUTES:
+            return None
+
+        first = start // BUCKET_MINUTES
+        last = first + duration // BUCKET_MINUTES
+        if last > BUCKETS_PER_DAY:
+            return np.empty(0, dtype=np.intp)
+
+        d = self.day_index[day]
+        available = self.available[:self.size, d]
+        booked = self.booked[:self.size, d]
+        free = np.ones(self.size, dtype=bool)
+        for word, mask in enumerate(split_words(bucket_mask(first, last))):
+            if mask:
+                mask = np.uint64(mask)
+                free &= (available[:, word] & mask) == mask
+                free &= (booked[:, word] & mask) == 0
+        return np.flatnonzero(free)
@@ -0,0 +1,193 @@
+"""
+Timing benchmarks for the scheduling core on seeded synthetic weeks.
+
+    python benchmark.py --sizes 10 1000 10000 100000 -o results.json
+
+For every roster size this times building the roster, TourScheduler.assign_tours with each
+solver, is_available_for_one_hour, and the row models behind the GUI list views. Results are
+written as JSON (best of --repeat runs, in seconds) so runs can be compared against each other.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+from scheduler_core import GROUP, WALK_IN, WEEKDAYS, Main
+from time_utils import format_time
+from view_rows import AvailabilityRows, TourCountRows, WeeklyTourRows
+
+
+SIZES = [10, 1000, 10000, 100000]
+
+# Rows a view draws when it first opens
+SCREEN_ROWS = 40
+
+
+def synthetic_roster(count, seed=0, fragmentation=0.5):
+    """
+    (name, {day: [(start, end), ...]}) entries for `count` navigators.
+
+    Navigators work on roughly 70% of weekdays, in one shift plus up to three more pieces with
+    gaps in between; `fragmentation` (0 to 1) is the chance of each extra piece. A few shifts
+    start off the quarter-hour so the exact, non-grid paths get exercised too.
+    """
+    rng = random.Random(seed)
+    roster = []
+    for i in range(count):
+        availability = {}
+        for day in WEEKDAYS:
+            if rng.random() >= 0.7:
+                continue
+            start = rng.randrange(8 * 60, 12 * 60, 15) + (5 if rng.random() < 0.05 else 0)
+            for _ in range(1 + sum(rng.random() < fragmentation for _ in range(3))):
+                end = min(start + rng.choice([45, 60, 90, 120, 180]), 18 * 60)
+                if end - start < 30:
+                    break
+                availability.setdefault(day, []).append((format_time(start), format_time(end)))
+                start = end + rng.choice([15, 30, 60, 90])
+        roster.append((f"Navigator {i}", availability))
+    return roster
+
+
+def synthetic_tours(navigator_count, seed=0, walk_in_rate=0.8, groups_per_navigator=0.05):
+    """
+    Tour requests in the format Main.add_tours takes.
+
+    Each default walk-in slot is requested with probability `walk_in_rate`. Group tours start on
+    the half hour between 9 AM and 4 PM, and their sizes cluster around the 30-student mark
+    where a second navigator becomes necessary.
+    """
+    rng = random.Random(seed)
+    walk_ins = {day: [time for time in ["10:00 AM", "3:00 PM"] if rng.random() < walk_in_rate] for day in WEEKDAYS}
+    group_tours = [
+        {
+            "day": rng.choice(WEEKDAYS),
+            "school": f"School {i}",
+            "time": format_time(rng.randrange(9 * 60, 16 * 60 + 1, 30)),
+            "students": round(rng.triangular(10, 50, 31)),
+        }
+        for i in range(max(1, int(navigator_count * groups_per_navigator)))
+    ]
+    return {"walk_ins": walk_ins, "group_tours": group_tours}
+
+
+def synthetic_week(count, seed=0):
+    main = Main()
+    for name, availability in synthetic_roster(count, seed):
+        main.add_navigator(name, availability)
+    main.add_tours(synthetic_tours(count, seed))
+    return main
+
+
+def best_of(repeat, run, setup=None):
+    """
+    Fastest of `repeat` timed calls of run(setup()), in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        run(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def render(model, rows):
+    for index in range(min(rows, model.row_count)):
+        model.render_row(index)
+
+
+def time_views(main, repeat):
+    results = {}
+    models = {
+        "availabilities": lambda: AvailabilityRows(main.schedule, main.tour_scheduler.catalogue.days),
+        "weekly_tours": lambda: WeeklyTourRows(main.tour_scheduler),
+        "tour_counts": lambda: TourCountRows(main.schedule),
+    }
+    for name, model in models.items():
+        results[f"view_{name}_open_s"] = best_of(repeat, lambda _: render(model(), SCREEN_ROWS))
+        results[f"view_{name}_all_rows_s"] = best_of(repeat, lambda _: render(model(), sys.maxsize))
+    results["display_all_availabilities_s"] = best_of(repeat, lambda _: main.schedule.display_all_availabilities())
+    return results
+
+
+def time_availability_checks(main, queries, seed):
+    rng = random.Random(seed)
+    navigators = main.schedule.navigators
+    checks = [
+        (rng.choice(navigators), rng.choice(WEEKDAYS), format_time(rng.randrange(8 * 60, 17 * 60, 15)))
+        for _ in range(queries)
+    ]
+    is_available = main.tour_scheduler.is_available_for_one_hour
+    start = time.perf_counter()
+    for navigator, day, time_text in checks:
+        is_available(navigator, day, time_text)
+    return (time.perf_counter() - start) / queries * 1e9
+
+
+def has_numpy():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run_size(count, seed, repeat, queries):
+    result = {"navigators": count}
+    result["build_s"] = best_of(repeat, lambda _: synthetic_week(count, seed))
+    week = synthetic_week(count, seed)
+    tours = week.tour_scheduler.all_tours()
+    result["walk_in_requests"] = sum(tour.kind == WALK_IN and tour.requested for tour in tours)
+    result["group_tours"] = sum(tour.kind == GROUP for tour in tours)
+
+    for solver in ["greedy", "optimal"]:
+        if solver == "optimal" and not has_numpy():
+            result["assign_optimal_s"] = None
+            continue
+        result[f"assign_{solver}_s"] = best_of(
+            repeat, lambda copy: copy.tour_scheduler.assign_tours(solver=solver), setup=week.copy
+        )
+
+    result["is_available_for_one_hour_ns"] = time_availability_checks(week, queries, seed)
+
+    week.tour_scheduler.assign_tours()
+    result.update(time_views(week, repeat))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the scheduling core on synthetic weeks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Roster sizes to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest is kept")
+    parser.add_argument("--queries", type=int, default=100000, help="is_available_for_one_hour calls to time")
+    parser.add_argument("-o", "--output", help="Where to write the JSON results (default: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.sizes:
+        print(f"benchmarking {count} navigators...", file=sys.stderr)
+        results.append(run_size(count, args.seed, args.repeat, args.queries))
+
+    report = json.dumps({
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Bulk group-tour booking import from CSV, JSONL or JSON files.
+
+CSV files have a `day,school,time,students` header, optionally followed by a `duration` column,
+and one booking per row. JSONL files have one {"day", "school", "time", "students", "duration"}
+object per line; JSON files hold a list of them, or {"group_tours": [...]} as Main.add_tours takes.
+
+There is no limit on bookings per day. Every booking is checked in one pass by
+TourScheduler.add_group_tours and every bad one is reported with its line number (its position in
+the list for JSON files) instead of stopping the import.
+"""
+import csv
+import json
+
+from scheduler_core import BookingReport
+
+
+BOOKING_FIELDS = ["day", "school", "time", "students"]
+
+
+def read_csv(file):
+    reader = csv.reader(file)
+    header = [column.strip().lower() for column in next(reader, [])]
+    if header not in (BOOKING_FIELDS, BOOKING_FIELDS + ["duration"]):
+        yield 1, None, "Expected a header of day,school,time,students[,duration]"
+        return
+    for row in reader:
+        if not "".join(row).strip():
+            continue
+        if len(row) != len(header):
+            yield reader.line_num, None, f"Expected {len(header)} fields, got {len(row)}"
+        else:
+            yield reader.line_num, dict(zip(header, row)), None
+
+
+def read_jsonl(file):
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            yield line_number, None, f"Malformed record: {error!r}"
+        else:
+            yield line_number, record, None
+
+
+def read_json(file):
+    try:
+        data = json.load(file)
+    except ValueError as error:
+        yield 1, None, f"Malformed file: {error!r}"
+        return
+    if isinstance(data, dict):
+        data = data.get("group_tours", [])
+    if not isinstance(data, list):
+        yield 1, None, "Expected a list of bookings"
+        return
+    for position, record in enumerate(data, start=1):
+        yield position, record, None
+
+
+def read_bookings(path):
+    """
+    Yield (line number, record, None) for every booking and (line number, None, message) for bad lines.
+
+    Records are passed on as read; TourScheduler.check_bookings reports any that are not objects.
+    """
+    if path.endswith((".jsonl", ".ndjson")):
+        reader = read_jsonl
+    elif path.endswith(".json"):
+        reader = read_json
+    else:
+        reader = read_csv
+    with open(path, newline="") as file:
+        yield from reader(file)
+
+
+def import_bookings(scheduler, path, strict=False):
+    """
+    Add every group tour booked in a CSV, JSONL or JSON file and return a BookingReport.
+
+    Errors in the report are (line number, message). With strict=True nothing is added if any
+    booking is malformed.
+    """
+    lines = []
+    bookings = []
+    report = BookingReport()
+    for line_number, record, error in read_bookings(path):
+        if error is not None:
+            report.errors.append((line_number, error))
+        else:
+            lines.append(line_number)
+            bookings.append(record)
+
+    if strict and report.errors:
+        # Still check the rest, so one run reports everything wrong with the file
+        _, errors = scheduler.check_bookings(bookings)
+    else:
+        checked = scheduler.add_group_tours(bookings, strict=strict)
+        report.added, errors = checked.added, checked.errors
+    report.errors.extend((lines[position], message) for position, message in errors)
+    report.errors.sort()
+    return report
@@ -0,0 +1,127 @@
+from bisect import bisect_left, insort
+from collections import OrderedDict, namedtuple
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize", "pinned"])
+
+# Slots without tours kept before the least recently used one is dropped
+DEFAULT_MAXSIZE = 1024
+
+
+class CandidateLists:
+    """
+    For each tracked slot (day, start minute, duration), the set of navigator ids free for it.
+
+    A slot's set is built once when the slot is first tracked, then kept current as navigators
+    are added or change: a change on one day only re-checks that navigator against the slots
+    tracked for that day, and a booking change only against the slots overlapping the booked
+    window, so a set is never stale and never needs rebuilding. Slots that have
+    tours are pinned and kept for good, so scheduling only ever reads their sets. Of the other
+    slots (ones only asked about, e.g. by time recommendations) at most `maxsize` are kept; past
+    that the least recently used one is dropped and rebuilt if asked for again. The sets are
+    shared, so callers must not modify them.
+    """
+
+    def __init__(self, schedule, maxsize=DEFAULT_MAXSIZE):
+        self.schedule = schedule
+        self.maxsize = maxsize
+        self.slots = OrderedDict()  # (day, start, duration) -> set of free navigator ids, oldest use first
+        self.pinned = {}  # (day, start, duration) -> set of free navigator ids, for slots with tours
+        self.by_day = {}  # day -> {(start, duration): ids} tracked on that day
+        self.order = {}  # day -> the same (start, duration) keys, sorted
+        self.longest = 0  # Longest duration ever tracked, bounding which slots a booking can touch
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def for_schedule(cls, schedule, maxsize=DEFAULT_MAXSIZE):
+        lists = cls(schedule, maxsize)
+        schedule.add_listener(lists)
+        return lists
+
+    def get(self, day, start, duration):
+        """
+        The slot's candidate set, or None if it is not tracked; counts as a hit or a miss.
+        """
+        slot = (day, start, duration)
+        ids = self.pinned.get(slot)
+        if ids is not None:
+            self.hits += 1
+            return ids
+        ids = self.slots.get(slot)
+        if ids is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.slots.move_to_end(slot)
+        return ids
+
+    def track(self, day, start, duration, ids=None):
+        """
+        Start keeping the slot's candidate set, seeded with `ids` if the caller already knows them.
+        """
+        slot = (day, start, duration)
+        if slot in self.pinned:
+            return self.pinned[slot]
+        if slot in self.slots:
+            self.slots.move_to_end(slot)
+            return self.slots[slot]
+        ids = self.slots[slot] = self.add(day, start, duration, ids)
+        while len(self.slots) > self.maxsize:
+            (old_day, old_start, old_duration), _ = self.slots.popitem(last=False)
+            del self.by_day[old_day][old_start, old_duration]
+            order = self.order[old_day]
+            del order[bisect_left(order, (old_start, old_duration))]
+            self.evictions += 1
+        return ids
+
+    def pin(self, day, start, duration):
+        """
+        Track the slot for good, e.g. once it has a tour; it is never evicted after this.
+        """
+        slot = (day, start, duration)
+        ids = self.pinned.get(slot)
+        if ids is None:
+            ids = self.slots.pop(slot, None)
+            if ids is None:
+                ids = self.add(day, start, duration)
+            self.pinned[slot] = ids
+        return ids
+
+    def add(self, day, start, duration, ids=None):
+        if ids is None:
+            ids = {navi.id for navi in self.schedule.navigators if navi.is_free(day, start, duration)}
+        self.by_day.setdefault(day, {})[start, duration] = ids
+        insort(self.order.setdefault(day, []), (start, duration))
+        self.longest = max(self.longest, duration)
+        return ids
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.slots) + len(self.pinned),
+                         len(self.pinned))
+
+    def navigator_added(self, navigator):
+        for day, slots in self.by_day.items():
+            for (start, duration), ids in slots.items():
+                if navigator.is_free(day, start, duration):
+                    ids.add(navigator.id)
+
+    def navigator_changed(self, navigator, day, window=None):
+        slots = self.by_day.get(day)
+        if not slots:
+            return
+        if window is None:
+            keys = list(slots)
+        else:
+            # Only slots overlapping the window can have changed: those starting less than the
+            # longest duration before it, up to its end
+            first, last = window
+            order = self.order[day]
+            keys = order[bisect_left(order, (first - self.longest + 1,)):bisect_left(order, (last,))]
+        for start, duration in keys:
+            ids = slots[start, duration]
+            if navigator.is_free(day, start, duration):
+                ids.add(navigator.id)
+            else:
+                ids.discard(navigator.id)
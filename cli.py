@@ -0,0 +1,164 @@
+"""
+Command-line entry point for batch scheduling.
+
+    python cli.py roster.json tours.json -o results.json [--solver optimal] [--store week.db]
+
+The roster can also be a CSV or JSONL availability export (see roster_import), or a SQLite file
+written by schedule_store, in which case its tours and assignments are loaded too. The roster
+JSON file holds {"navigators": [{"name": ..., "availability": {day: [[start, end], ...]}}]}
+and the tour file holds {"walk_ins": {day: [time, ...]}, "group_tours": [{"day", "school", "time",
+"students", "duration"}]}. --slots names a JSON slot catalogue (see scheduler_core.SlotCatalogue) with
+the days, walk-in times and tour lengths to use instead of the weekday defaults. Nothing here imports
+tkinter; pass --gui to open the loaded schedule in the app. --csv and --ics-dir export the assigned
+week as a CSV file and as one calendar per navigator (see schedule_export). --bookings adds group
+tours from a CSV, JSONL or JSON booking file (see booking_import), any number per day.
+"""
+import argparse
+import json
+import sys
+from datetime import date
+
+from scheduler_core import Main, SlotCatalogue, StaffingPolicy
+
+
+def load_json(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Assign navigators to walk-in and group tours.")
+    parser.add_argument("roster", help="JSON roster, CSV/JSONL availability export, or a .db schedule store")
+    parser.add_argument("tours", nargs="?", help="JSON file with requested walk-in and group tours")
+    parser.add_argument("-o", "--output", help="Where to write the results (default: stdout)")
+    parser.add_argument("--solver", choices=["greedy", "optimal"], default="greedy")
+    parser.add_argument("--slots", help="JSON slot catalogue: days, walk-in times and tour durations")
+    parser.add_argument("--students-per-navigator", type=int, default=30, help="Group size each navigator covers")
+    parser.add_argument("--min-navigators", type=int, default=1, help="Fewest navigators on a group tour")
+    parser.add_argument("--max-navigators", type=int, default=2,
+                        help="Most navigators on a group tour (0 for no limit)")
+    parser.add_argument("--bookings", help="CSV, JSONL or JSON file of group-tour bookings to add")
+    parser.add_argument("--store", help="Save the assigned week to this SQLite schedule store")
+    parser.add_argument("--gui", action="store_true", help="Open the scheduler window after assigning")
+    parser.add_argument("--csv", help="Export the assigned tours to this CSV file")
+    parser.add_argument("--ics-dir", help="Write one .ics calendar per navigator into this directory")
+    parser.add_argument("--week-start", type=date.fromisoformat, help="First day of the calendar (default: next Monday)")
+    parser.add_argument("--weeks", type=int, default=1, help="Weeks the calendar events repeat for")
+    parser.add_argument("--stats", action="store_true", help="Print run timings and counters to stderr")
+    parser.add_argument("--profile", action="store_true", help="Print a cProfile summary of the run to stderr")
+    return parser.parse_args(argv)
+
+
+def is_store(path):
+    return path.endswith((".db", ".sqlite", ".sqlite3"))
+
+
+def run(args):
+    catalogue = SlotCatalogue.from_dict(load_json(args.slots)) if args.slots else None
+    policy = StaffingPolicy(args.students_per_navigator, args.min_navigators, args.max_navigators or None)
+    if is_store(args.roster):
+        from schedule_store import ScheduleStore
+
+        with ScheduleStore(args.roster) as store:
+            main = store.load(catalogue, policy)
+    elif args.roster.endswith((".csv", ".jsonl", ".ndjson")):
+        from roster_import import import_roster
+
+        main = Main(catalogue, policy)
+        report = import_roster(main.schedule, args.roster)
+        for line_number, message in report.errors:
+            print(f"{args.roster}:{line_number}: {message}", file=sys.stderr)
+    else:
+        main = Main(catalogue, policy)
+        roster = load_json(args.roster)
+        main.add_navigators(roster["navigators"] if isinstance(roster, dict) else roster)
+    if args.tours:
+        main.add_tours(load_json(args.tours))
+    if args.bookings:
+        from booking_import import import_bookings
+
+        report = import_bookings(main.tour_scheduler, args.bookings)
+        for line_number, message in report.errors:
+            print(f"{args.bookings}:{line_number}: {message}", file=sys.stderr)
+
+    if args.stats or args.profile:
+        from scheduler_stats import SchedulerStats
+
+        main.tour_scheduler.stats = SchedulerStats(profile=args.profile)
+    main.tour_scheduler.assign_tours(solver=args.solver)
+    report_short_tours(main.tour_scheduler.short_tours())
+    report_stats(main.tour_scheduler, args)
+
+    if args.store:
+        from schedule_store import ScheduleStore
+
+        with ScheduleStore(args.store) as store:
+            store.save(main)
+
+    export(main, args)
+
+    results = json.dumps(main.results(), indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(results + "\n")
+    else:
+        print(results)
+    return main
+
+
+def report_short_tours(short, shown=20):
+    if not short:
+        return
+    print(f"{len(short)} tour(s) have fewer navigators than they need:", file=sys.stderr)
+    for tour, needed in short[:shown]:
+        print(f"  {tour.day} {tour.time} {tour.school or 'walk-in'}: {len(tour.navigators)} of {needed}",
+              file=sys.stderr)
+    if len(short) > shown:
+        print(f"  ... and {len(short) - shown} more (see short_tours in the results)", file=sys.stderr)
+
+
+def export(main, args):
+    if not (args.csv or args.ics_dir):
+        return
+    import schedule_export
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            schedule_export.write_csv(main, file)
+    if args.ics_dir:
+        schedule_export.write_navigator_calendars(main, args.ics_dir, args.week_start, args.weeks)
+
+
+def report_stats(scheduler, args):
+    stats = scheduler.stats
+    if stats is None:
+        return
+    if args.stats:
+        # The candidate cache outlives single runs, so its totals are reported next to the run's own
+        report = dict(stats.as_dict(), candidate_cache=scheduler.candidates.cache_info()._asdict())
+        print(json.dumps(report, indent=2), file=sys.stderr)
+    if args.profile and stats.profile is not None:
+        stats.profile.stream = sys.stderr
+        stats.profile.sort_stats("cumulative").print_stats(20)
+
+
+def open_gui(main):
+    # Only pay for tkinter/customtkinter when a window is actually wanted
+    import tkinter as tk
+    from Practice import TourSchedulerGUI
+
+    root = tk.Tk()
+    TourSchedulerGUI(root, main)
+    root.mainloop()
+
+
+def cli(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    main = run(args)
+    if args.gui:
+        open_gui(main)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
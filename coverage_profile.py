@@ -0,0 +1,125 @@
+from itertools import accumulate
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def free_intervals(navigator, day):
+    """
+    (start, end) minutes of one day when the navigator is available and not booked on a tour.
+    """
+    starts, ends = navigator.day_intervals(day)
+    booked_starts, booked_ends = navigator.day_bookings(day)
+    free = []
+    j = 0
+    for start, end in zip(starts, ends):
+        while j < len(booked_starts) and booked_ends[j] <= start:
+            j += 1
+        cursor = start
+        k = j
+        while k < len(booked_starts) and booked_starts[k] < end:
+            if booked_starts[k] > cursor:
+                free.append((cursor, booked_starts[k]))
+            cursor = max(cursor, booked_ends[k])
+            k += 1
+        if cursor < end:
+            free.append((cursor, end))
+    return free
+
+
+class CoverageProfile:
+    """
+    For each day and tour length, how many navigators are free for a tour starting at each minute.
+
+    A navigator free over [a, b) can take a D-minute tour starting anywhere in [a, b - D], so
+    each free interval adds +1 at a and -1 just past b - D in a per-(day, duration) difference
+    array, and the prefix sum of that array is the exact count for every start minute at once.
+    Free intervals are availability minus booked tours. When a navigator changes, only their old
+    intervals for that day are taken back out and the new ones put in; the prefix sums are
+    rebuilt lazily on the next query.
+    """
+
+    def __init__(self, schedule, days, durations):
+        self.schedule = schedule
+        self.days = list(days)
+        self.durations = []
+        self.free = {}  # (navigator id, day) -> free intervals last counted
+        self.deltas = {}  # (day, duration) -> difference array over start minutes
+        self.counts = {}  # (day, duration) -> prefix sums, dropped whenever the deltas change
+        for duration in durations:
+            self.add_duration(duration)
+
+    @classmethod
+    def for_schedule(cls, schedule, days, durations):
+        profile = cls(schedule, days, durations)
+        for navigator in schedule.navigators:
+            profile.navigator_added(navigator)
+        schedule.add_listener(profile)
+        return profile
+
+    def add_duration(self, duration):
+        if duration in self.durations:
+            return
+        self.durations.append(duration)
+        for (_, day), intervals in self.free.items():
+            self.count(day, duration, intervals, 1)
+
+    def navigator_added(self, navigator):
+        for day in self.days:
+            self.navigator_changed(navigator, day)
+
+    def navigator_changed(self, navigator, day, window=None):
+        if day not in self.days:
+            self.days.append(day)
+        key = (navigator.id, day)
+        intervals = free_intervals(navigator, day)
+        previous = self.free.get(key, [])
+        if intervals == previous:
+            return
+        for duration in self.durations:
+            self.count(day, duration, previous, -1)
+            self.count(day, duration, intervals, 1)
+        if intervals:
+            self.free[key] = intervals
+        else:
+            self.free.pop(key, None)
+
+    def count(self, day, duration, intervals, sign):
+        deltas = self.deltas.get((day, duration))
+        if deltas is None:
+            deltas = self.deltas[day, duration] = [0] * (MINUTES_PER_DAY + 1)
+        for start, end in intervals:
+            last = min(end, MINUTES_PER_DAY) - duration  # Latest start that still fits
+            if last >= start:
+                deltas[start] += sign
+                deltas[last + 1] -= sign
+        self.counts.pop((day, duration), None)
+
+    def free_counts(self, day, duration):
+        """
+        Navigators free for a `duration`-minute tour starting at each minute of the day.
+        """
+        self.add_duration(duration)
+        key = (day, duration)
+        if key not in self.counts:
+            deltas = self.deltas.get(key)
+            self.counts[key] = list(accumulate(deltas[:MINUTES_PER_DAY])) if deltas else [0] * MINUTES_PER_DAY
+        return self.counts[key]
+
+    def free_count(self, day, start, duration):
+        return self.free_counts(day, duration)[start] if 0 <= start < MINUTES_PER_DAY else 0
+
+    def recommend(self, day, navigators, duration, step=15, earliest=0, latest=MINUTES_PER_DAY):
+        """
+        (start minute, free navigators, slack) for each start on the `step` grid that can be
+        staffed by `navigators` navigators, most slack first and earlier times breaking ties.
+        """
+        counts = self.free_counts(day, duration)
+        first = -(-earliest // step) * step
+        options = [
+            (start, counts[start], counts[start] - navigators)
+            for start in range(first, min(latest, MINUTES_PER_DAY), step)
+            if counts[start] >= navigators
+        ]
+        options.sort(key=lambda option: (-option[2], option[0]))
+        return options
@@ -0,0 +1,185 @@
+import numpy as np
+
+
+class FlowSolver:
+    """
+    Whole-week assignment as a min-cost flow with a convex cost on tour_count.
+
+    The network is source -> tour time -> navigator -> sink. Tours that share a day, start time
+    and duration form one class whose supply is their combined demand (one per walk-in, one or two per
+    group tour), and each navigator can take at most one unit from a class. Navigator -> sink
+    edges cost 1, 3, 5, ... for the first, second, third tour on top of the current
+    tour_count, so the total cost is the sum of squared loads.
+
+    Every other edge costs zero, so the successive shortest path step reduces to finding the
+    least-loaded navigator reachable by an alternating path (hand a navigator the new tour,
+    let them pass one of their tours to someone else, and so on) and flipping that path.
+    Demand is routed one unit at a time this way; a class that has no augmenting path left
+    can never get one later, so coverage is maximal, and routing each unit to the least-loaded
+    reachable navigator keeps the load vector optimal for every convex cost when all demand
+    is covered.
+
+    Tours that overlap in time without sharing a start and duration (a 10:00 walk-in and a
+    10:30 group tour, or a 30 and a 90 minute group tour both at 10:00) are separate classes,
+    so a navigator is only offered a class while they hold no class overlapping it. That keeps
+    every navigator's tours disjoint, but it is a heuristic: one navigator covering two
+    overlapping tours is not a flow constraint. The search turns down swaps it cannot make. Routing classes in start order can then box navigators in, and
+    the result can cover fewer tours than the greedy pass. So whenever `any_conflicts` is set,
+    TourScheduler.assign_tours also runs the greedy pass and keeps whichever covers more.
+    Before comparing, each result is improved by moving navigators off a clashing tour.
+
+    The searches work on a classes x navigators boolean matrix, so each BFS level is one
+    vectorized step over the roster.
+    """
+
+    def __init__(self, tour_scheduler, rng=None):
+        self.tour_scheduler = tour_scheduler
+        self.navigators = tour_scheduler.schedule.navigators
+        self.rng = rng or np.random.default_rng()
+        self.any_conflicts = False  # Set by solve() when some pending tour times overlap
+
+    def collect_classes(self):
+        """
+        Group the tours that still need navigators by (day, start minute, duration).
+        """
+        scheduler = self.tour_scheduler
+        classes = {}
+        # Days are kept sorted by start with walk-ins first, so each class lists walk-ins ahead of group tours
+        for tour in scheduler.all_tours():
+            missing = scheduler.slot_needed(tour) - len(tour.navigators)
+            if missing > 0:
+                classes.setdefault((tour.day, tour.start, tour.duration), []).append((tour, missing))
+
+        day_order = {day: i for i, day in enumerate(scheduler.days)}
+        return sorted(classes.items(), key=lambda item: (day_order[item[0][0]],) + item[0][1:])
+
+    def eligibility(self, classes):
+        eligible = np.zeros((len(classes), len(self.navigators)), dtype=bool)
+        for row, ((day, start, duration), _) in enumerate(classes):
+            eligible[row, sorted(self.tour_scheduler.eligible_ids(day, start, duration))] = True
+        return eligible
+
+    def overlaps(self, classes):
+        """
+        classes x classes matrix, True where two different classes on the same day overlap in time.
+        """
+        spans = [(day, start, start + duration) for (day, start, duration), _ in classes]
+        overlaps = np.zeros((len(classes), len(classes)), dtype=bool)
+        for row, (day, start, end) in enumerate(spans):
+            for other, (other_day, other_start, other_end) in enumerate(spans):
+                if other != row and day == other_day and start < other_end and other_start < end:
+                    overlaps[row, other] = True
+        return overlaps
+
+    def solve(self, progress=None, cancel=None):
+        """
+        Staff the week. Returns False, leaving the schedule untouched, if cancel.is_set() mid-run.
+        """
+        classes = self.collect_classes()
+        if not classes or not self.navigators:
+            return True
+
+        self.eligible = self.eligibility(classes)
+        self.flow = np.zeros_like(self.eligible)
+        self.load = np.array([navigator.tour_count for navigator in self.navigators])
+        self.reachable = self.eligible.any(axis=0)
+        if not self.reachable.any():
+            return True  # No navigator can take any of the tours
+        self.conflicts = self.overlaps(classes)
+        self.any_conflicts = self.conflicts.any()
+        # blocked[c, n]: how many classes navigator n holds that overlap class c
+        self.blocked = np.zeros(self.eligible.shape, dtype=np.int32)
+
+        for row, (_, tours) in enumerate(classes):
+            if cancel is not None and cancel.is_set():
+                return False
+            demand = sum(missing for _, missing in tours)
+            for _ in range(demand):
+                if not self.augment(row):
+                    break
+            if progress is not None:
+                progress(row + 1, len(classes))
+
+        self.apply(classes)
+        return True
+
+    def augment(self, source):
+        """
+        Route one more unit of class `source` to the least-loaded navigator an alternating path reaches.
+        """
+        eligible, flow, load = self.eligible, self.flow, self.load
+        class_count, navigator_count = eligible.shape
+
+        # No navigator that can take any tour at all is below this load
+        floor = load[self.reachable].min()
+
+        came_from_class = np.full(navigator_count, -1)
+        came_from_navigator = np.full(class_count, -1)
+        seen_navigators = np.zeros(navigator_count, dtype=bool)
+        seen_classes = np.zeros(class_count, dtype=bool)
+        seen_classes[source] = True
+
+        best, best_load = -1, None
+        frontier = np.array([source])
+        while frontier.size:
+            # Class -> navigator: eligible navigators not already on that class
+            reach = eligible[frontier] & ~flow[frontier] & ~seen_navigators
+            if self.any_conflicts:
+                # ...who hold no class overlapping it
+                reach &= self.blocked[frontier] == 0
+            found = np.flatnonzero(reach.any(axis=0))
+            if not found.size:
+                break
+            came_from_class[found] = frontier[reach[:, found].argmax(axis=0)]
+            seen_navigators[found] = True
+
+            loads = load[found]
+            lowest = loads.min()
+            if best_load is None or lowest < best_load:
+                best, best_load = self.rng.choice(found[loads == lowest]), lowest
+                if best_load <= floor:
+                    break
+
+            # Navigator -> class: a navigator can hand one of their tours on to someone else
+            held = flow[:, found] & ~seen_classes[:, None]
+            frontier = np.flatnonzero(held.any(axis=1))
+            if not frontier.size:
+                break
+            came_from_navigator[frontier] = found[held[frontier].argmax(axis=1)]
+            seen_classes[frontier] = True
+
+        if best < 0:
+            return False
+
+        navigator = best
+        while True:
+            row = came_from_class[navigator]
+            self.hold(row, navigator, True)
+            if row == source:
+                break
+            previous = came_from_navigator[row]
+            self.hold(row, previous, False)
+            navigator = previous
+        load[best] += 1
+        return True
+
+    def hold(self, row, navigator, held):
+        self.flow[row, navigator] = held
+        if self.any_conflicts:
+            change = self.conflicts[:, row].astype(np.int32)
+            self.blocked[:, navigator] += change if held else -change
+
+    def apply(self, classes):
+        for row, (_, tours) in enumerate(classes):
+            staff = [self.navigators[i] for i in np.flatnonzero(self.flow[row])]
+            for tour, missing in tours:
+                assigned, staff = staff[:missing], staff[missing:]
+                if not assigned:
+                    break
+                self.tour_scheduler.staff(tour, assigned)
+
+        if self.any_conflicts:
+            # The overlap rule can turn down placements a plain pass still finds
+            for _, tours in classes:
+                for tour, _ in tours:
+                    self.tour_scheduler.fill(tour)
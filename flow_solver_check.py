@@ -0,0 +1,217 @@
+"""
+Cross-check FlowSolver against a textbook min-cost flow on small random weeks.
+
+    python flow_solver_check.py --trials 500 --seed 0
+
+Each trial builds a small roster and a day of tours that start on the hour and last an hour, so
+no two tour times overlap. The same network FlowSolver works on (source -> tour time ->
+navigator -> sink, navigator -> sink edges costing 1, 3, 5, ... on top of the current tour
+count) is solved with successive shortest paths found by Bellman-Ford, and FlowSolver must
+cover exactly as many navigator-slots at exactly the same cost. Trials include navigators who
+can take none of the tours and tours nobody can take.
+
+Mixed-duration weeks (30, 60 and 90 minute tours, several sharing a start) overlap, so no flow
+bound applies; there TourScheduler.assign_tours(solver="optimal") must only place navigators on
+tours they are available for the whole of, never on two clashing tours, and must staff a short
+tour a navigator is only free for when a longer one starts at the same time. Exits with status 1
+on any mismatch.
+"""
+import argparse
+import random
+import sys
+
+import numpy as np
+
+from flow_solver import FlowSolver
+from scheduler_core import Main
+from time_utils import format_time
+
+
+def random_week(rng):
+    """
+    A Main with a few navigators, some with tours already counted, and a handful of pending tours.
+    """
+    main = Main()
+    for i in range(rng.randint(1, 7)):
+        availability = {}
+        for day in rng.sample(["Monday", "Tuesday"], rng.randint(0, 2)):
+            start = rng.randrange(9, 15) * 60
+            availability[day] = [(format_time(start), format_time(start + rng.randrange(1, 5) * 60))]
+        main.add_navigator(f"Navigator {i}", availability)
+        main.schedule.navigators[-1].tour_count = rng.randint(0, 3)
+
+    scheduler = main.tour_scheduler
+    for _ in range(rng.randint(1, 8)):
+        day = rng.choice(["Monday", "Tuesday", "Wednesday"])
+        time = format_time(rng.randrange(9, 16) * 60)
+        if rng.random() < 0.5:
+            scheduler.request_walk_in(day, time)
+        else:
+            scheduler.add_group_tour(day, f"School {rng.randrange(100)}", time, rng.randint(5, 60), 60)
+    return main
+
+
+def bellman_ford_flow(demands, eligible, loads):
+    """
+    (units routed, cost) of a min-cost maximum flow, found one shortest augmenting path at a time.
+    """
+    class_count, navigator_count = eligible.shape
+    source, sink = 0, 1 + class_count + navigator_count
+    graph = [[] for _ in range(sink + 1)]  # node -> edge ids; edge = [to, capacity, cost, reverse edge id]
+    edges = []
+
+    def add_edge(a, b, capacity, cost):
+        graph[a].append(len(edges))
+        edges.append([b, capacity, cost, len(edges) + 1])
+        graph[b].append(len(edges))
+        edges.append([a, 0, -cost, len(edges) - 1])
+
+    total = sum(demands)
+    for row, demand in enumerate(demands):
+        add_edge(source, 1 + row, demand, 0)
+        for navigator in range(navigator_count):
+            if eligible[row, navigator]:
+                add_edge(1 + row, 1 + class_count + navigator, 1, 0)
+    for navigator, load in enumerate(loads):
+        for k in range(total):
+            add_edge(1 + class_count + navigator, sink, 1, 2 * (load + k) + 1)
+
+    routed = cost = 0
+    while True:
+        distance = [None] * (sink + 1)
+        via = [None] * (sink + 1)
+        distance[source] = 0
+        for _ in range(sink):
+            changed = False
+            for node in range(sink + 1):
+                if distance[node] is None:
+                    continue
+                for edge_id in graph[node]:
+                    to, capacity, edge_cost, _ = edges[edge_id]
+                    if capacity and (distance[to] is None or distance[node] + edge_cost < distance[to]):
+                        distance[to] = distance[node] + edge_cost
+                        via[to] = edge_id
+                        changed = True
+            if not changed:
+                break
+        if distance[sink] is None:
+            return routed, cost
+        node = sink
+        while node != source:
+            edge_id = via[node]
+            edges[edge_id][1] -= 1
+            edges[edges[edge_id][3]][1] += 1
+            node = edges[edges[edge_id][3]][0]
+        routed += 1
+        cost += distance[sink]
+
+
+def check(main, seed):
+    """
+    None if FlowSolver matches the textbook flow on this week, else a description of the mismatch.
+    """
+    scheduler = main.tour_scheduler
+    solver = FlowSolver(scheduler, np.random.default_rng(seed))
+    classes = solver.collect_classes()
+    loads = [navigator.tour_count for navigator in main.schedule.navigators]
+    expected = (0, 0)
+    if classes:
+        demands = [sum(missing for _, missing in tours) for _, tours in classes]
+        expected = bellman_ford_flow(demands, solver.eligibility(classes), loads)
+
+    solver.solve()
+    routed = sum(len(tour.navigators) for _, tours in classes for tour, _ in tours)
+    cost = sum(navigator.tour_count ** 2 - load ** 2 for navigator, load in zip(main.schedule.navigators, loads))
+    if (routed, cost) != expected:
+        return f"FlowSolver routed {routed} at cost {cost}, Bellman-Ford {expected[0]} at cost {expected[1]}"
+    return None
+
+
+def mixed_week(rng):
+    """
+    A Main whose tours last 30, 60 or 90 minutes, with starts on the half hour so many share one.
+    """
+    main = Main()
+    for i in range(rng.randint(1, 6)):
+        start = rng.randrange(18, 30) * 30
+        end = start + rng.randrange(1, 7) * 30
+        main.add_navigator(f"Navigator {i}", {"Monday": [(format_time(start), format_time(end))]})
+
+    scheduler = main.tour_scheduler
+    for _ in range(rng.randint(1, 8)):
+        time = format_time(rng.randrange(18, 32) * 30)
+        duration = rng.choice([30, 60, 90])
+        if rng.random() < 0.3:
+            scheduler.request_walk_in("Monday", time, duration=duration)
+        else:
+            scheduler.add_group_tour("Monday", f"School {rng.randrange(100)}", time, rng.randint(5, 60), duration)
+    return main
+
+
+def check_mixed(main):
+    """
+    None if every navigator the optimal solver placed is free for the whole tour, else the first problem.
+    """
+    scheduler = main.tour_scheduler
+    scheduler.assign_tours(solver="optimal")
+    held = {}
+    for tour in scheduler.all_tours():
+        for name in tour.navigators:
+            navigator = main.schedule.get_navigator(name)
+            if not navigator.is_available(tour.day, tour.start, tour.duration):
+                return f"{name} is not available for all of the {format_time(tour.start)} tour"
+            for other in held.get(name, ()):
+                if other.start < tour.start + tour.duration and tour.start < other.start + other.duration:
+                    return f"{name} holds clashing tours at {format_time(other.start)} and {format_time(tour.start)}"
+            held.setdefault(name, []).append(tour)
+    return None
+
+
+def check_same_start():
+    """
+    A navigator free 10:00-10:30 must take the 30 minute tour when a 90 minute one also starts at 10:00.
+    """
+    main = Main()
+    main.add_navigator("Navigator 0", {"Monday": [("10:00 AM", "10:30 AM")]})
+    scheduler = main.tour_scheduler
+    short = scheduler.add_group_tour("Monday", "School 0", "10:00 AM", 10, 30)
+    scheduler.add_group_tour("Monday", "School 1", "10:00 AM", 10, 90)
+    scheduler.assign_tours(solver="optimal")
+    if short.navigators != ["Navigator 0"]:
+        return f"the 30 minute tour got {short.navigators}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check FlowSolver against a textbook min-cost flow.")
+    parser.add_argument("--trials", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failures = 0
+    for trial in range(args.trials):
+        rng = random.Random(args.seed * 1_000_003 + trial)
+        problem = check(random_week(rng), trial)
+        if problem:
+            failures += 1
+            print(f"trial {trial}: {problem}")
+    print(f"{args.trials - failures} of {args.trials} trials match")
+
+    mixed_failures = 0
+    for trial in range(args.trials):
+        rng = random.Random(args.seed * 1_000_003 + trial)
+        problem = check_mixed(mixed_week(rng))
+        if problem:
+            mixed_failures += 1
+            print(f"mixed trial {trial}: {problem}")
+    problem = check_same_start()
+    if problem:
+        mixed_failures += 1
+        print(f"same-start tours: {problem}")
+    print(f"{args.trials + 1 - mixed_failures} of {args.trials + 1} mixed-duration checks pass")
+    failures += mixed_failures
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
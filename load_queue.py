@@ -0,0 +1,79 @@
+import heapq
+import random
+from array import array
+
+
+class LoadQueue:
+    """
+    Navigators ordered by tour count, for picking the least-loaded eligible ones.
+
+    Navigator ids are grouped into one set per tour count, and a heap holds the counts that
+    have navigators in them. Ties inside a count are broken by sampling uniformly at pick
+    time, which is exactly what shuffling the candidates and taking `min` by tour count did,
+    so fairness is unchanged while a pick only touches the lowest few counts.
+    """
+
+    def __init__(self, rng=None):
+        self.random = rng or random.Random()
+        self.levels = {}  # tour_count -> set of navigator ids
+        self.heap = []  # tour counts that may have navigators; empty ones are dropped lazily
+        self.queued = set()  # tour counts currently in the heap
+        self.count_of = array("l")  # navigator id -> tour count it is filed under, -1 if not filed
+
+    @classmethod
+    def for_schedule(cls, schedule, rng=None):
+        queue = cls(rng)
+        for navigator in schedule.navigators:
+            queue.navigator_added(navigator)
+        schedule.add_listener(queue)
+        return queue
+
+    def navigator_added(self, navigator):
+        self.file(navigator.id, navigator.tour_count)
+
+    def navigator_changed(self, navigator, day, window=None):
+        if self.count_of[navigator.id] != navigator.tour_count:
+            self.file(navigator.id, navigator.tour_count)
+
+    def file(self, navigator_id, count):
+        if navigator_id >= len(self.count_of):
+            self.count_of.extend([-1] * (navigator_id + 1 - len(self.count_of)))
+        previous = self.count_of[navigator_id]
+        if previous >= 0:
+            self.levels[previous].discard(navigator_id)
+        self.count_of[navigator_id] = count
+        self.levels.setdefault(count, set()).add(navigator_id)
+        if count not in self.queued:
+            self.queued.add(count)
+            heapq.heappush(self.heap, count)
+
+    def pick(self, k, eligible):
+        """
+        Up to k ids from the set `eligible` with the lowest tour counts, least loaded first.
+        """
+        chosen = []
+        visited = []
+        while len(chosen) < k and self.heap:
+            count = heapq.heappop(self.heap)
+            level = self.levels.get(count)
+            if not level:
+                self.queued.discard(count)
+                continue
+            visited.append(count)
+
+            # Intersect from whichever side is smaller
+            if len(level) <= len(eligible):
+                tied = [navigator_id for navigator_id in level if navigator_id in eligible]
+            else:
+                tied = [navigator_id for navigator_id in eligible if navigator_id in level]
+
+            needed = k - len(chosen)
+            if len(tied) > needed:
+                tied = self.random.sample(tied, needed)
+            else:
+                self.random.shuffle(tied)
+            chosen.extend(tied)
+
+        for count in visited:
+            heapq.heappush(self.heap, count)
+        return chosen
@@ -0,0 +1,113 @@
+"""
+Memory benchmark for the navigator roster.
+
+Builds the same seeded synthetic roster twice, once with the current compact Navigator and once
+with the old dict-per-navigator layout, and reports tracemalloc bytes per navigator for each:
+
+    python memory_benchmark.py --navigators 20000 100000
+"""
+import argparse
+import random
+import tracemalloc
+
+from scheduler_core import WEEKDAYS, Main, Navigator, Schedule
+from time_utils import format_time, parse_time
+
+
+class LegacyNavigator:
+    """
+    The layout Navigator had before it was compacted, kept only as a baseline to measure against.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.availability = {}
+        self.intervals = {}
+        self.tour_count = 0
+        self.assigned_tours = set()
+        self.id = None
+        self.owner = None
+
+    def add_availability(self, day, start_time, end_time):
+        self.availability.setdefault(day, []).append((start_time, end_time))
+        starts, ends = self.intervals.setdefault(day, ([], []))
+        starts.append(parse_time(start_time))
+        ends.append(parse_time(end_time))
+
+
+def synthetic_roster(count, seed=0):
+    """
+    (name, {day: [(start, end), ...]}) for `count` navigators with one to three shifts a day.
+    """
+    rng = random.Random(seed)
+    roster = []
+    for i in range(count):
+        availability = {}
+        for day in WEEKDAYS:
+            start = rng.randrange(8 * 60, 11 * 60, 15)
+            for _ in range(rng.randint(1, 3)):
+                end = start + rng.choice([60, 90, 120])
+                availability.setdefault(day, []).append((format_time(start), format_time(end)))
+                start = end + rng.choice([30, 60])
+        roster.append((f"Navigator {i}", availability))
+    return roster
+
+
+def measure(build):
+    tracemalloc.start()
+    try:
+        kept = build()  # noqa: F841 - held so the roster is still allocated when measured
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def build_legacy(roster):
+    navigators = []
+    for name, availability in roster:
+        navigator = LegacyNavigator(name)
+        for day, times in availability.items():
+            for start_time, end_time in times:
+                navigator.add_availability(day, start_time, end_time)
+        navigator.id = len(navigators)
+        navigators.append(navigator)
+    return navigators
+
+
+def build_compact(roster):
+    schedule = Schedule()
+    for name, availability in roster:
+        navigator = Navigator(name)
+        for day, times in availability.items():
+            for start_time, end_time in times:
+                navigator.add_availability(day, start_time, end_time)
+        schedule.add_navigator(navigator)
+    return schedule
+
+
+def build_main(roster):
+    main = Main()
+    for name, availability in roster:
+        main.add_navigator(name, availability)
+    return main
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roster memory per navigator, old layout vs compact.")
+    parser.add_argument("--navigators", type=int, nargs="+", default=[1000, 20000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'navigators':>10} {'legacy B/nav':>13} {'compact B/nav':>14} {'with scheduler':>15} {'ratio':>7}")
+    for count in args.navigators:
+        roster = synthetic_roster(count, args.seed)
+        # Warm the parse cache so it is not charged to whichever layout runs first
+        build_legacy(roster[:100])
+        legacy = measure(lambda: build_legacy(roster)) / count
+        compact = measure(lambda: build_compact(roster)) / count
+        full = measure(lambda: build_main(roster)) / count
+        print(f"{count:>10} {legacy:>13.0f} {compact:>14.0f} {full:>15.0f} {legacy / compact:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
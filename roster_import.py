@@ -0,0 +1,170 @@
+"""
+Bulk roster import from CSV or JSONL files.
+
+CSV files have a `name,day,start,end` header and one availability interval per row. JSONL files
+have one object per line, either {"name", "day", "start", "end"} or
+{"name", "availability": {day: [[start, end], ...]}}.
+
+Rows are streamed through a generator pipeline (read -> chunk -> validate -> build), so memory
+stays flat however long the file is. Large files are validated in a process pool with a bounded
+number of chunks in flight. Every malformed row is reported with its line number instead of
+stopping the import.
+"""
+import calendar
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from scheduler_core import Navigator, day_name
+from time_utils import parse_time
+
+
+DAY_NAMES = set(calendar.day_name)
+
+# Files smaller than this are validated in-process; starting workers costs more than it saves
+PARALLEL_MIN_BYTES = 1 << 20
+
+
+class ImportReport:
+    def __init__(self):
+        self.navigators_added = 0
+        self.intervals = 0
+        self.errors = []  # (line number, message)
+
+    def __repr__(self):
+        return (f"ImportReport(navigators_added={self.navigators_added}, intervals={self.intervals}, "
+                f"errors={len(self.errors)})")
+
+
+def read_csv(file):
+    reader = csv.reader(file)
+    header = [column.strip().lower() for column in next(reader, [])]
+    if header != ["name", "day", "start", "end"]:
+        yield 1, "Expected a header of name,day,start,end"
+        return
+    for row in reader:
+        if not "".join(row).strip():
+            continue
+        if len(row) != 4:
+            yield reader.line_num, f"Expected 4 fields, got {len(row)}"
+        else:
+            yield reader.line_num, tuple(row)
+
+
+def read_jsonl(file):
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            name = record["name"]
+            if "availability" in record:
+                for day, times in record["availability"].items():
+                    for start, end in times:
+                        yield line_number, (name, day, start, end)
+            else:
+                yield line_number, (name, record["day"], record["start"], record["end"])
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            yield line_number, f"Malformed record: {error!r}"
+
+
+def read_rows(path):
+    """
+    Yield (line number, (name, day, start, end)) for every interval, or (line number, message) for bad lines.
+    """
+    reader = read_jsonl if path.endswith((".jsonl", ".ndjson")) else read_csv
+    with open(path, newline="") as file:
+        yield from reader(file)
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def validate_chunk(chunk):
+    """
+    Parse one chunk of rows. Returns (valid rows, errors); runs in worker processes for large files.
+    """
+    valid = []
+    errors = []
+    for line_number, record in chunk:
+        if isinstance(record, str):
+            errors.append((line_number, record))
+            continue
+
+        name, day, start_time, end_time = record
+        name, day, start_time, end_time = str(name).strip(), day_name(day), str(start_time), str(end_time)
+        if not name:
+            errors.append((line_number, "Missing navigator name"))
+        elif day not in DAY_NAMES:
+            errors.append((line_number, f"Unknown day {day!r}"))
+        else:
+            try:
+                start, end = parse_time(start_time), parse_time(end_time)
+            except ValueError:
+                errors.append((line_number, f"Invalid time in {start_time!r} to {end_time!r}"))
+                continue
+            if end <= start:
+                errors.append((line_number, f"End time {end_time} must be after start time {start_time}"))
+            else:
+                valid.append((name, day, start_time, end_time, start, end))
+    return valid, errors
+
+
+def validated_chunks(chunks, workers):
+    """
+    Validate chunks in order, keeping at most a couple of chunks per worker in flight.
+    """
+    if workers <= 1:
+        yield from map(validate_chunk, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(validate_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def import_roster(schedule, path, chunk_size=5000, workers=None, strict=False):
+    """
+    Stream a CSV or JSONL roster into the schedule and return an ImportReport.
+
+    Rows for navigators already on the schedule extend their availability. With strict=True nothing
+    is added if any row is malformed.
+    """
+    if workers is None:
+        workers = (os.cpu_count() or 1) if os.path.getsize(path) >= PARALLEL_MIN_BYTES else 1
+
+    report = ImportReport()
+    staged = {}  # name -> new Navigator, in first-seen order
+    extra = []  # Rows for navigators already on the schedule, applied once the file checks out
+    for valid, errors in validated_chunks(chunked(read_rows(path), chunk_size), workers):
+        report.errors.extend(errors)
+        for name, day, start_time, end_time, start, end in valid:
+            navigator = schedule.get_navigator(name)
+            if navigator is not None:
+                extra.append((navigator, day, start_time, end_time, start, end))
+            else:
+                if name not in staged:
+                    staged[name] = Navigator(name)
+                staged[name].add_availability(day, start_time, end_time, start, end)
+            report.intervals += 1
+
+    if strict and report.errors:
+        report.intervals = 0
+        return report
+
+    for navigator, day, start_time, end_time, start, end in extra:
+        navigator.add_availability(day, start_time, end_time, start, end)
+    for navigator in staged.values():
+        schedule.add_navigator(navigator)
+    report.navigators_added = len(staged)
+    return report
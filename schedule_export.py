@@ -0,0 +1,164 @@
+"""
+Streaming exports of the assigned week: CSV for spreadsheets and ICS calendars per navigator.
+
+Every exporter is a generator of rows or lines written out as it goes, so a large roster is never
+held as one document in memory. Tours are weekly, so each calendar event is dated in the week
+starting `week_start` (next Monday by default) and repeats weekly for `weeks` weeks.
+"""
+import csv
+import os
+import re
+from datetime import date, datetime, timedelta, timezone
+
+from scheduler_core import DAY_CODES, WALK_IN
+from time_utils import format_time
+
+
+CSV_HEADER = ["day", "start", "end", "kind", "school", "students", "navigator"]
+
+# RFC 5545 wants content lines folded at 75 octets
+ICS_LINE_OCTETS = 75
+
+
+def tours_in_order(scheduler):
+    """
+    Every tour, day by day in catalogue order, each day in start-time order.
+    """
+    for day in scheduler.days:
+        yield from scheduler.days[day]
+
+
+def csv_rows(main):
+    """
+    One row per navigator on each tour; unstaffed requested tours get a row with no navigator.
+    """
+    for tour in tours_in_order(main.tour_scheduler):
+        if tour.kind == WALK_IN and not tour.requested:
+            continue
+        row = [tour.day, tour.time, format_time(tour.start + tour.duration), tour.kind, tour.school or "",
+               tour.students if tour.kind != WALK_IN else ""]
+        for name in tour.navigators or [""]:
+            yield row + [name]
+
+
+def write_csv(main, file):
+    writer = csv.writer(file)
+    writer.writerow(CSV_HEADER)
+    writer.writerows(csv_rows(main))
+
+
+def escape_text(text):
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold(line):
+    """
+    The line split into CRLF-terminated pieces of at most 75 octets, continuations indented.
+    """
+    data = line.encode("utf-8")
+    if len(data) <= ICS_LINE_OCTETS:
+        return line + "\r\n"
+    pieces = []
+    limit = ICS_LINE_OCTETS
+    while data:
+        cut = min(limit, len(data))
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:  # Never split a UTF-8 sequence
+            cut -= 1
+        pieces.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+        limit = ICS_LINE_OCTETS - 1  # Room for the leading space
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def day_date(week_start, day):
+    """
+    The date `day` falls on in the week starting at `week_start`.
+    """
+    offset = (DAY_CODES[day] - week_start.weekday()) % 7 if day in DAY_CODES else 0
+    return week_start + timedelta(days=offset)
+
+
+def ics_events(navigator_name, tours, week_start, weeks, stamp):
+    """
+    VEVENT lines, unfolded, for the tours one navigator staffs.
+    """
+    for tour in tours:
+        start = datetime.combine(day_date(week_start, tour.day), datetime.min.time()) + timedelta(minutes=tour.start)
+        end = start + timedelta(minutes=tour.duration)
+        if tour.kind == WALK_IN:
+            summary = "Walk-in tour"
+        else:
+            summary = f"Group tour: {tour.school} ({tour.students} students)"
+        others = [name for name in tour.navigators if name != navigator_name]
+        yield "BEGIN:VEVENT"
+        yield f"UID:{slug(tour.day)}-{tour.start}-{tour.sequence}-{slug(navigator_name)}@tour-scheduler"
+        yield f"DTSTAMP:{stamp}"
+        yield f"DTSTART:{start:%Y%m%dT%H%M%S}"
+        yield f"DTEND:{end:%Y%m%dT%H%M%S}"
+        if weeks > 1:
+            yield f"RRULE:FREQ=WEEKLY;COUNT={weeks}"
+        yield f"SUMMARY:{escape_text(summary)}"
+        if others:
+            yield f"DESCRIPTION:{escape_text('With ' + ', '.join(others))}"
+        yield "END:VEVENT"
+
+
+def ics_lines(navigator_name, tours, week_start, weeks=1, stamp=None):
+    """
+    A whole calendar for one navigator as folded, CRLF-terminated lines.
+    """
+    stamp = stamp or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR\r\n"
+    yield "VERSION:2.0\r\n"
+    yield "PRODID:-//Tour Scheduler//Navigator Calendar//EN\r\n"
+    yield fold(f"X-WR-CALNAME:{escape_text(navigator_name)} tours")
+    for line in ics_events(navigator_name, tours, week_start, weeks, stamp):
+        yield fold(line)
+    yield "END:VCALENDAR\r\n"
+
+
+def tours_by_navigator(scheduler):
+    """
+    navigator name -> the tours they staff, in week order.
+    """
+    tours = {}
+    for tour in tours_in_order(scheduler):
+        for name in tour.navigators:
+            tours.setdefault(name, []).append(tour)
+    return tours
+
+
+def slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-")
+
+
+def calendar_filename(navigator):
+    return f"{slug(navigator.name) or 'navigator'}-{navigator.id}.ics"
+
+
+def write_navigator_calendars(main, directory, week_start=None, weeks=1, include_idle=False):
+    """
+    Write one .ics file per navigator into `directory` and return how many were written.
+
+    Navigators without tours are skipped unless include_idle is set.
+    """
+    week_start = week_start or next_monday()
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    tours = tours_by_navigator(main.tour_scheduler)
+    written = 0
+    for navigator in main.schedule.navigators:
+        staffed = tours.get(navigator.name, [])
+        if not staffed and not include_idle:
+            continue
+        path = os.path.join(directory, calendar_filename(navigator))
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.writelines(ics_lines(navigator.name, staffed, week_start, weeks, stamp))
+        written += 1
+    return written
+
+
+def next_monday(today=None):
+    today = today or date.today()
+    return today + timedelta(days=(7 - today.weekday()) % 7)
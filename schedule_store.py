@@ -0,0 +1,235 @@
+import gc
+import json
+import sqlite3
+
+from scheduler_core import WALK_IN, Main, Navigator, SlotCatalogue
+from time_utils import parse_time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS navigators (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+-- Merged minute intervals, used for eligibility queries
+CREATE TABLE IF NOT EXISTS availability (
+    navigator_id INTEGER NOT NULL REFERENCES navigators (id),
+    day TEXT NOT NULL,
+    start_minute INTEGER NOT NULL,
+    end_minute INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS availability_window ON availability (day, start_minute, end_minute, navigator_id);
+
+CREATE TABLE IF NOT EXISTS walk_in_slots (
+    day TEXT NOT NULL,
+    time TEXT NOT NULL,
+    requested INTEGER NOT NULL,
+    duration INTEGER NOT NULL DEFAULT 60,
+    PRIMARY KEY (day, time)
+);
+
+CREATE TABLE IF NOT EXISTS group_tours (
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    school TEXT NOT NULL,
+    time TEXT NOT NULL,
+    students INTEGER NOT NULL,
+    duration INTEGER NOT NULL DEFAULT 60
+);
+
+-- group_tour_id is NULL for walk-in assignments
+CREATE TABLE IF NOT EXISTS assignments (
+    navigator_id INTEGER NOT NULL REFERENCES navigators (id),
+    day TEXT NOT NULL,
+    time TEXT NOT NULL,
+    group_tour_id INTEGER REFERENCES group_tours (id)
+);
+CREATE INDEX IF NOT EXISTS assignments_slot ON assignments (day, time, navigator_id);
+
+-- The SlotCatalogue the week was saved with, as SlotCatalogue.to_dict JSON; one row at most
+CREATE TABLE IF NOT EXISTS catalogue (
+    data TEXT NOT NULL
+);
+"""
+
+# Columns added after the first release; older files get them with their defaults on open
+ADDED_COLUMNS = [
+    ("walk_in_slots", "duration", "INTEGER NOT NULL DEFAULT 60"),
+    ("group_tours", "duration", "INTEGER NOT NULL DEFAULT 60"),
+]
+
+
+class ScheduleStore:
+    """
+    Navigators, availability, tours and assignments in a local SQLite file.
+
+    save() rewrites the whole week in one transaction with bulk executemany inserts, and load()
+    rebuilds a Main from a few ordered scans without re-parsing any times. The slot catalogue is
+    saved too, and load() uses it unless given another. Eligibility questions can also be
+    answered in the database through the (day, start, end) index.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # Assignments keep their time as text; overlap checks need it in minutes
+        self.connection.create_function("parse_time", 1, parse_time, deterministic=True)
+        self.connection.executescript(SCHEMA)
+        self.upgrade()
+
+    def upgrade(self):
+        with self.connection:
+            for table, column, definition in ADDED_COLUMNS:
+                columns = [row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")]
+                if column not in columns:
+                    self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def save(self, main):
+        navigators = main.schedule.navigators
+        scheduler = main.tour_scheduler
+        schedule = main.schedule
+
+        with self.connection:
+            for table in ["catalogue", "assignments", "group_tours", "walk_in_slots", "availability", "navigators"]:
+                self.connection.execute(f"DELETE FROM {table}")
+
+            self.connection.execute(
+                "INSERT INTO catalogue (data) VALUES (?)", (json.dumps(scheduler.catalogue.to_dict()),)
+            )
+
+            self.connection.executemany(
+                "INSERT INTO navigators (id, name) VALUES (?, ?)",
+                ((navigator.id, navigator.name) for navigator in navigators),
+            )
+            self.connection.executemany(
+                "INSERT INTO availability (navigator_id, day, start_minute, end_minute) VALUES (?, ?, ?, ?)",
+                (
+                    (navigator.id, day, start, end)
+                    for navigator in navigators
+                    for day, (starts, ends) in navigator.intervals.items()
+                    for start, end in zip(starts, ends)
+                ),
+            )
+
+            walk_in_rows = []
+            group_rows = []
+            assignment_rows = []
+            for day, tours in scheduler.days.items():
+                position = 0
+                for tour in tours:
+                    if tour.kind == WALK_IN:
+                        walk_in_rows.append((day, tour.time, tour.requested, tour.duration))
+                        tour_id = None
+                    else:
+                        tour_id = len(group_rows)
+                        group_rows.append(
+                            (tour_id, day, position, tour.school, tour.time, tour.students, tour.duration)
+                        )
+                        position += 1
+                    for name in tour.navigators:
+                        assignment_rows.append((schedule.get_navigator(name).id, day, tour.time, tour_id))
+
+            self.connection.executemany(
+                "INSERT INTO walk_in_slots (day, time, requested, duration) VALUES (?, ?, ?, ?)", walk_in_rows
+            )
+            self.connection.executemany(
+                "INSERT INTO group_tours (id, day, position, school, time, students, duration) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                group_rows,
+            )
+            self.connection.executemany(
+                "INSERT INTO assignments (navigator_id, day, time, group_tour_id) VALUES (?, ?, ?, ?)",
+                assignment_rows,
+            )
+
+    def load(self, catalogue=None, policy=None):
+        # Loading allocates many small objects at once; pausing the cyclic GC avoids repeated full scans
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self.read(catalogue, policy)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def read(self, catalogue=None, policy=None):
+        if catalogue is None:
+            row = self.connection.execute("SELECT data FROM catalogue").fetchone()
+            if row is not None:
+                catalogue = SlotCatalogue.from_dict(json.loads(row[0]))
+        main = Main(catalogue, policy)
+        navigators = {}
+        for navigator_id, name in self.connection.execute("SELECT id, name FROM navigators ORDER BY id"):
+            navigators[navigator_id] = Navigator(name)
+
+        # Intervals were saved merged and in minutes, so no times are parsed here
+        rows = self.connection.execute(
+            "SELECT navigator_id, day, start_minute, end_minute FROM availability ORDER BY rowid"
+        )
+        for navigator_id, day, start, end in rows:
+            navigators[navigator_id].merge(day, start, end)
+
+        for navigator in navigators.values():
+            main.schedule.add_navigator(navigator)
+
+        scheduler = main.tour_scheduler
+        rows = self.connection.execute("SELECT day, time, requested, duration FROM walk_in_slots ORDER BY rowid")
+        for day, time, requested, duration in rows:
+            scheduler.request_walk_in(day, time, bool(requested), duration)
+
+        group_tours = {}
+        rows = self.connection.execute(
+            "SELECT id, day, school, time, students, duration FROM group_tours ORDER BY day, position"
+        )
+        for tour_id, day, school, time, students, duration in rows:
+            group_tours[tour_id] = scheduler.add_group_tour(day, school, time, students, duration)
+
+        # Replay assignments through the scheduler so counts and tour dependencies are rebuilt
+        rows = self.connection.execute(
+            "SELECT navigator_id, day, time, group_tour_id FROM assignments ORDER BY rowid"
+        )
+        for navigator_id, day, time, group_tour_id in rows:
+            if group_tour_id is None:
+                tour = scheduler.walk_ins[day, parse_time(time)]
+            else:
+                tour = group_tours[group_tour_id]
+            navigator = navigators[navigator_id]
+            # Older stores may double-book someone or staff a tour past their availability; those tours stay open
+            if navigator.is_free(tour.day, tour.start, tour.duration):
+                scheduler.staff(tour, [navigator])
+        return main
+
+    def eligible_navigator_ids(self, day, start, duration=60, free=False):
+        """
+        Ids of navigators whose availability covers [start, start + duration) on the given day.
+
+        With free=True, navigators assigned a tour overlapping that window are left out too, as
+        Navigator.is_free does. Tour lengths come from walk_in_slots and group_tours.
+        """
+        query = (
+            "SELECT DISTINCT navigator_id FROM availability "
+            "WHERE day = ? AND start_minute <= ? AND end_minute >= ?"
+        )
+        parameters = [day, start, start + duration]
+        if free:
+            query += (
+                " AND navigator_id NOT IN ("
+                "SELECT a.navigator_id FROM assignments a "
+                "LEFT JOIN group_tours g ON g.id = a.group_tour_id "
+                "LEFT JOIN walk_in_slots w ON a.group_tour_id IS NULL AND w.day = a.day AND w.time = a.time "
+                "WHERE a.day = ? AND parse_time(a.time) < ? "
+                "AND parse_time(a.time) + COALESCE(g.duration, w.duration, 60) > ?)"
+            )
+            parameters += [day, start + duration, start]
+        return [navigator_id for navigator_id, in self.connection.execute(query, parameters)]
@@ -0,0 +1,1015 @@
+import calendar
+import copy
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from contextlib import nullcontext
+
+from candidate_lists import CandidateLists
+from load_queue import LoadQueue
+from time_utils import format_time, parse_time
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+# Navigator availability is keyed by week minute: day code * DAY_SPAN + minute since midnight.
+# DAY_SPAN leaves a gap after each day so intervals on neighbouring days never touch. The codes
+# are fixed, so a misspelled day can never become a new day.
+DAY_SPAN = 2048
+DAY_NAMES = tuple(calendar.day_name)
+DAY_CODES = {day: code for code, day in enumerate(DAY_NAMES)}
+
+WALK_IN = "walk_in"
+GROUP = "group"
+DEFAULT_WALK_IN_TIMES = ["10:00 AM", "3:00 PM"]
+TOUR_MINUTES = 60
+TOUR_DURATIONS = [30, 60, 90]
+
+# Below this many navigators a plain scan beats building the NumPy bitmap (and importing NumPy)
+INDEX_MIN_NAVIGATORS = 256
+
+
+def day_name(day):
+    """
+    A day as typed by a person ("monday ", "MONDAY") in the form the scheduler keys days by.
+    """
+    return str(day).strip().capitalize()
+
+
+def day_code(day):
+    """
+    Small integer for a day name; ValueError for anything but Monday to Sunday.
+    """
+    code = DAY_CODES.get(day)
+    if code is None:
+        raise ValueError(f"Unknown day {day!r}; expected one of {', '.join(DAY_NAMES)}")
+    return code
+
+
+class Navigator:
+    """
+    One navigator, stored compactly for large rosters.
+
+    Availability lives in a single array of week minutes (day code * DAY_SPAN + minute since
+    midnight): the first half holds the starts and the second half the ends of merged, sorted,
+    disjoint intervals. `availability` and `intervals` are rebuilt from it on demand, so times
+    display in canonical form. Booked tours are kept the same way in `booked`, which is only
+    allocated on first assignment; a navigator's tours never overlap, so both the starts and the
+    ends are sorted and an overlap check is two bisects.
+    """
+
+    __slots__ = ("name", "id", "owner", "tour_count", "spans", "booked")
+
+    def __init__(self, name):
+        self.name = name
+        self.id = None  # Position in the owning schedule
+        self.owner = None  # Schedule notified whenever availability or assignments change
+        self.tour_count = 0
+        self.spans = array("I")
+        self.booked = None  # Week-minute starts then ends of booked tours, created on first assignment
+
+    def changed(self, day, window=None):
+        if self.owner is not None:
+            self.owner.navigator_changed(self, day, window)
+
+    @property
+    def availability(self):
+        return {
+            day: [(format_time(start), format_time(end)) for start, end in zip(starts, ends)]
+            for day, (starts, ends) in self.intervals.items()
+        }
+
+    @property
+    def intervals(self):
+        """
+        day -> (starts, ends) in minutes, merged, sorted and disjoint.
+        """
+        intervals = {}
+        count = len(self.spans) // 2
+        for start, end in zip(self.spans[:count], self.spans[count:]):
+            code, start = divmod(start, DAY_SPAN)
+            starts, ends = intervals.setdefault(DAY_NAMES[code], ([], []))
+            starts.append(start)
+            ends.append(end - code * DAY_SPAN)
+        return intervals
+
+    def day_range(self, day):
+        """
+        (first, last, count): the day's intervals are spans[first:last] (starts) and
+        spans[count + first:count + last] (ends).
+        """
+        count = len(self.spans) // 2
+        code = DAY_CODES.get(day)
+        if code is None:
+            return 0, 0, count
+        first = bisect_left(self.spans, code * DAY_SPAN, 0, count)
+        last = bisect_left(self.spans, (code + 1) * DAY_SPAN, first, count)
+        return first, last, count
+
+    def day_intervals(self, day):
+        """
+        (starts, ends) in minutes for one day.
+        """
+        first, last, count = self.day_range(day)
+        if first == last:
+            return [], []
+        offset = DAY_CODES[day] * DAY_SPAN
+        return ([start - offset for start in self.spans[first:last]],
+                [end - offset for end in self.spans[count + first:count + last]])
+
+    def day_bookings(self, day):
+        """
+        (starts, ends) in minutes of the tours booked on one day.
+        """
+        if not self.booked or day not in DAY_CODES:
+            return [], []
+        offset = DAY_CODES[day] * DAY_SPAN
+        count = len(self.booked) // 2
+        first = bisect_left(self.booked, offset, 0, count)
+        last = bisect_left(self.booked, offset + DAY_SPAN, first, count)
+        return ([start - offset for start in self.booked[first:last]],
+                [end - offset for end in self.booked[count + first:count + last]])
+
+    def add_availability(self, day, start_time, end_time, start=None, end=None):
+        # Bulk loaders that already parsed the times pass the minutes in to skip parsing again
+        if start is None or end is None:
+            start, end = parse_time(start_time), parse_time(end_time)
+        if end <= start:
+            raise ValueError(f"End time {end_time} must be after start time {start_time}")
+        self.add_interval(day, start, end)
+
+    def add_interval(self, day, start, end):
+        self.merge(day, start, end)
+        self.changed(day)
+
+    def merge(self, day, start, end):
+        offset = day_code(day) * DAY_SPAN
+        start += offset
+        end += offset
+        count = len(self.spans) // 2
+        starts, ends = self.spans[:count].tolist(), self.spans[count:].tolist()
+
+        # Merge with every interval that overlaps or touches [start, end]
+        first = bisect_left(ends, start)
+        last = bisect_right(starts, end)
+        if first < last:
+            start = min(start, starts[first])
+            end = max(end, ends[last - 1])
+        starts[first:last] = [start]
+        ends[first:last] = [end]
+        self.spans = array("I", starts + ends)
+
+    def set_availability(self, day, times):
+        # Check everything up front so a bad entry leaves the old availability in place
+        day_code(day)
+        parsed = [(parse_time(start_time), parse_time(end_time)) for start_time, end_time in times]
+        if any(end <= start for start, end in parsed):
+            raise ValueError(f"End time must be after start time on {day}")
+
+        first, last, count = self.day_range(day)
+        self.spans = self.spans[:first] + self.spans[last:count + first] + self.spans[count + last:]
+        for start, end in parsed:
+            self.merge(day, start, end)
+        self.changed(day)
+
+    def is_available(self, day, start, duration=60):
+        """
+        Check if one availability interval covers [start, start + duration) minutes on the given day.
+        """
+        code = DAY_CODES.get(day)
+        if code is None:
+            return False
+        start += code * DAY_SPAN
+        count = len(self.spans) // 2
+        index = bisect_right(self.spans, start, 0, count) - 1
+        return index >= 0 and start + duration <= self.spans[count + index]
+
+    def increment_tour_count(self):
+        self.tour_count += 1
+
+    def is_booked(self, day, start, duration=TOUR_MINUTES):
+        """
+        Check if a booked tour overlaps [start, start + duration) minutes on the given day.
+        """
+        if not self.booked or day not in DAY_CODES:
+            return False
+        start += DAY_CODES[day] * DAY_SPAN
+        count = len(self.booked) // 2
+        # The first tour ending after `start` is the only one that can overlap
+        index = bisect_right(self.booked, start, count, 2 * count) - count
+        return index < count and self.booked[index] < start + duration
+
+    def is_free(self, day, start, duration=TOUR_MINUTES):
+        return self.is_available(day, start, duration) and not self.is_booked(day, start, duration)
+
+    def assign_tour(self, day, start, duration=TOUR_MINUTES):
+        if self.is_booked(day, start, duration):
+            raise ValueError(f"{self.name} already has a tour overlapping {format_time(start)} on {day}")
+        window = (start, start + duration)
+        start += day_code(day) * DAY_SPAN
+        booked = self.booked or array("I")
+        count = len(booked) // 2
+        index = bisect_left(booked, start, 0, count)
+        starts, ends = booked[:count].tolist(), booked[count:].tolist()
+        starts.insert(index, start)
+        ends.insert(index, start + duration)
+        self.booked = array("I", starts + ends)
+        self.increment_tour_count()
+        self.changed(day, window)
+
+    def release_tour(self, day, start):
+        if not self.booked or day not in DAY_CODES:
+            return
+        offset = DAY_CODES[day] * DAY_SPAN
+        count = len(self.booked) // 2
+        index = bisect_left(self.booked, start + offset, 0, count)
+        if index < count and self.booked[index] == start + offset:
+            window = (start, self.booked[count + index] - offset)
+            self.booked = self.booked[:index] + self.booked[index + 1:count + index] + self.booked[count + index + 1:]
+            self.tour_count -= 1
+            self.changed(day, window)
+
+    def display_availability(self):
+        return self.availability
+
+    def display_tour_count(self):
+        return self.tour_count
+
+
+class Schedule:
+    def __init__(self):
+        self.navigators = []  # Indexed by navigator id, which never changes once assigned
+        self.by_name = {}  # name -> navigator; tours refer to navigators by name
+        # Objects with navigator_added(navigator) and navigator_changed(navigator, day, window), where
+        # window is the (start, end) minutes a booking change is confined to, or None for any change
+        self.listeners = []
+
+    def add_navigator(self, navigator):
+        if navigator.name in self.by_name:
+            raise ValueError(f"A navigator named {navigator.name!r} is already on the schedule")
+        navigator.id = len(self.navigators)
+        navigator.owner = self
+        self.navigators.append(navigator)
+        self.by_name[navigator.name] = navigator
+        for listener in self.listeners:
+            listener.navigator_added(navigator)
+
+    def get_navigator(self, name):
+        """
+        The navigator with this name, or None.
+        """
+        return self.by_name.get(name)
+
+    def navigator_for_id(self, navigator_id):
+        return self.navigators[navigator_id]
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def navigator_changed(self, navigator, day, window=None):
+        for listener in self.listeners:
+            listener.navigator_changed(navigator, day, window)
+
+    def display_all_availabilities(self):
+        return {navigator.name: navigator.display_availability() for navigator in self.navigators}
+
+
+class Tour:
+    """
+    One walk-in slot or group tour on one day.
+
+    Times are kept as minutes since midnight; `time` formats them back for display. A walk-in
+    slot only needs a navigator once it has been requested, and navigators are held by name.
+    """
+
+    __slots__ = ("kind", "day", "start", "duration", "school", "students", "requested", "navigators", "sequence")
+
+    def __init__(self, kind, day, start, duration=TOUR_MINUTES, school=None, students=0, requested=True):
+        self.kind = kind
+        self.day = day
+        self.start = start
+        self.duration = duration
+        self.school = school
+        self.students = students
+        self.requested = requested
+        self.navigators = []
+        self.sequence = 0  # Insertion order, set by the scheduler; breaks ties between equal start times
+
+    @property
+    def time(self):
+        return format_time(self.start)
+
+    def sort_key(self):
+        # Walk-ins come before group tours starting at the same time, as they are staffed first
+        return self.start, self.kind != WALK_IN, self.sequence
+
+    def state(self):
+        """
+        What a walk-in slot shows: None if not requested, "Pending" until staffed, else the navigator's name.
+        """
+        if not self.requested:
+            return None
+        return self.navigators[0] if self.navigators else "Pending"
+
+    def as_dict(self):
+        return {"school": self.school, "time": self.time, "duration": self.duration, "students": self.students,
+                "navigators": list(self.navigators)}
+
+
+class BookingReport:
+    """
+    What TourScheduler.add_group_tours did: the tours it added and every booking it rejected.
+    """
+
+    def __init__(self):
+        self.added = []
+        self.errors = []  # (position of the booking, message)
+
+    def __repr__(self):
+        return f"BookingReport(added={len(self.added)}, errors={len(self.errors)})"
+
+
+class SlotCatalogue:
+    """
+    The days tours run on, the walk-in slot times offered each day, and the allowed tour lengths.
+
+    Days are calendar day names, Monday to Sunday. Walk-in slots last `walk_in_minutes`; group
+    tours may pick any of `durations` and default to `default_minutes`.
+    """
+
+    def __init__(self, days=WEEKDAYS, walk_in_times=DEFAULT_WALK_IN_TIMES, durations=TOUR_DURATIONS,
+                 walk_in_minutes=TOUR_MINUTES, default_minutes=TOUR_MINUTES):
+        self.days = list(days)
+        for day in self.days:
+            day_code(day)
+        self.walk_in_times = [parse_time(time) for time in walk_in_times]
+        self.durations = sorted(set(durations))
+        self.walk_in_minutes = self.check_duration(walk_in_minutes)
+        self.default_minutes = self.check_duration(default_minutes)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        A catalogue from {"days": [...], "walk_in_times": [...], "durations": [...], "walk_in_minutes",
+        "default_minutes"}; missing keys keep their defaults.
+        """
+        keys = ["days", "walk_in_times", "durations", "walk_in_minutes", "default_minutes"]
+        return cls(**{key: data[key] for key in keys if key in data})
+
+    def to_dict(self):
+        return {
+            "days": self.days,
+            "walk_in_times": [format_time(start) for start in self.walk_in_times],
+            "durations": self.durations,
+            "walk_in_minutes": self.walk_in_minutes,
+            "default_minutes": self.default_minutes,
+        }
+
+    def check_duration(self, minutes):
+        minutes = int(minutes)
+        if minutes not in self.durations:
+            allowed = ", ".join(str(duration) for duration in self.durations)
+            raise ValueError(f"Tours can last {allowed} minutes, not {minutes}")
+        return minutes
+
+    def walk_in_slots(self):
+        return [(day, start) for day in self.days for start in self.walk_in_times]
+
+
+class StaffingPolicy:
+    """
+    How many navigators a group tour needs: one per `students_per_navigator` students, rounded
+    up, and never fewer than `minimum` or more than `maximum` (None for no cap).
+
+    The defaults are the original rule: one navigator, plus a second above 30 students.
+    """
+
+    def __init__(self, students_per_navigator=30, minimum=1, maximum=2):
+        if students_per_navigator < 1 or minimum < 0 or (maximum is not None and maximum < minimum):
+            raise ValueError("Staffing needs at least one student per navigator and minimum <= maximum")
+        self.students_per_navigator = students_per_navigator
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        A policy from {"students_per_navigator", "minimum", "maximum"}; missing keys keep their defaults.
+        """
+        keys = ["students_per_navigator", "minimum", "maximum"]
+        return cls(**{key: data[key] for key in keys if key in data})
+
+    def navigators_for(self, students):
+        needed = max(self.minimum, -(-students // self.students_per_navigator))
+        return needed if self.maximum is None else min(needed, self.maximum)
+
+
+class Snapshot:
+    """
+    The week's assignments and tour counts as they were when the snapshot was taken.
+
+    Nothing is copied up front: the scheduler hands every live snapshot a tour's navigator list
+    and a navigator's tour count just before their first change, so a snapshot costs one dict
+    entry per changed record. Tours never mutate their navigator lists in place, so keeping a
+    reference is enough. Availability and the set of tours are not part of a snapshot.
+    """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.saved_tours = {}  # Tour -> navigator names before its first change
+        self.saved_counts = {}  # navigator id -> tour_count before its first change
+
+    def navigators_of(self, tour):
+        return self.saved_tours.get(tour, tour.navigators)
+
+    def tour_count(self, navigator):
+        return self.saved_counts.get(navigator.id, navigator.tour_count)
+
+    def changed_tours(self):
+        """
+        Tours whose navigators differ now from when the snapshot was taken.
+        """
+        return [tour for tour, names in self.saved_tours.items() if tour.navigators != names]
+
+    def differences(self, other):
+        """
+        (tour, navigators here, navigators in `other`) for each tour the two snapshots disagree on.
+
+        Both must be from the same scheduler; e.g. snapshot after each of two runs started from
+        the same state, rolling back in between.
+        """
+        tours = self.saved_tours.keys() | other.saved_tours.keys()
+        return sorted(
+            ((tour, self.navigators_of(tour), other.navigators_of(tour)) for tour in tours
+             if sorted(self.navigators_of(tour)) != sorted(other.navigators_of(tour))),
+            key=lambda difference: (DAY_CODES.get(difference[0].day, len(DAY_CODES)), difference[0].sort_key()),
+        )
+
+    def close(self):
+        """
+        Stop recording into this snapshot.
+        """
+        self.scheduler.discard_snapshot(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TourScheduler:
+    def __init__(self, schedule, catalogue=None, policy=None):
+        self.schedule = schedule
+        self.catalogue = catalogue or SlotCatalogue()
+        self.policy = policy or StaffingPolicy()
+        self.days = {day: [] for day in self.catalogue.days}  # day -> tours in Tour.sort_key order
+        self.walk_ins = {}  # (day, start minute) -> walk-in Tour
+        self.sequence = 0
+        self.index = None  # AvailabilityIndex, built on demand for large rosters
+        self.coverage = None  # CoverageProfile, built on the first time recommendation
+        self.candidates = CandidateLists.for_schedule(schedule)  # Eligible ids per slot that has tours
+        self.load_queue = LoadQueue.for_schedule(schedule)
+        self.dependents = {}  # (navigator id, day) -> tours that navigator staffs on that day
+        self.stats = None  # SchedulerStats to instrument runs with; None keeps the hot paths bare
+        self.snapshots = []  # Live Snapshots, told about each record before it changes
+        for day, start in self.catalogue.walk_in_slots():
+            self.request_walk_in(day, format_time(start), requested=False)
+
+    def add_tour(self, tour):
+        self.sequence += 1
+        tour.sequence = self.sequence
+        insort(self.days.setdefault(tour.day, []), tour, key=Tour.sort_key)
+        if tour.kind == WALK_IN:
+            self.walk_ins[tour.day, tour.start] = tour
+        self.pin_slot(tour.day, tour.start, tour.duration)
+        return tour
+
+    def add_group_tour(self, day, school, time, students, duration=None):
+        duration = self.catalogue.default_minutes if duration is None else self.catalogue.check_duration(duration)
+        return self.add_tour(Tour(GROUP, day, parse_time(time), duration, school=school, students=int(students)))
+
+    def add_group_tours(self, bookings, strict=False):
+        """
+        Add many group tours at once from dicts like {"day", "school", "time", "students", "duration"}.
+
+        Every booking is checked before any is added, and problems are collected in the returned
+        BookingReport by position instead of stopping at the first one. Valid bookings are added
+        in one sorted merge per day. With strict=True nothing is added if any booking is invalid.
+        """
+        report = BookingReport()
+        tours, report.errors = self.check_bookings(bookings)
+        if strict and report.errors:
+            return report
+
+        by_day = {}
+        for tour in tours:
+            self.sequence += 1
+            tour.sequence = self.sequence
+            by_day.setdefault(tour.day, []).append(tour)
+        for day, day_tours in by_day.items():
+            # One sort per day instead of an insort per tour
+            merged = self.days.setdefault(day, [])
+            merged.extend(day_tours)
+            merged.sort(key=Tour.sort_key)
+            for start, duration in {(tour.start, tour.duration) for tour in day_tours}:
+                self.pin_slot(day, start, duration)
+        report.added = tours
+        return report
+
+    def check_bookings(self, bookings):
+        """
+        ([new group Tours], [(position, message)]) for a batch of bookings, adding nothing.
+        """
+        tours = []
+        errors = []
+        for position, booking in enumerate(bookings):
+            if not isinstance(booking, dict):
+                errors.append((position, f"Malformed booking: expected an object, got {type(booking).__name__}"))
+                continue
+            try:
+                tour = self.booked_tour(booking)
+            except (KeyError, TypeError, AttributeError) as error:
+                errors.append((position, f"Malformed booking: {error!r}"))
+            except ValueError as error:
+                errors.append((position, str(error)))
+            else:
+                tours.append(tour)
+        return tours, errors
+
+    def booked_tour(self, booking):
+        """
+        The group Tour for one booking dict, or ValueError saying what is wrong with it.
+        """
+        day = day_name(booking["day"])
+        if day not in self.days:
+            raise ValueError(f"Unknown day {booking['day']!r}")
+        school = str(booking["school"]).strip()
+        if not school:
+            raise ValueError("Missing school name")
+        time = str(booking["time"]).strip()
+        try:
+            start = parse_time(time)
+        except ValueError:
+            raise ValueError(f"Invalid time {time!r}")
+        try:
+            students = int(booking["students"])
+        except ValueError:
+            raise ValueError(f"Invalid number of students {booking['students']!r}")
+        if students < 1:
+            raise ValueError(f"A group needs at least one student, not {students}")
+        duration = booking.get("duration")
+        duration = self.catalogue.default_minutes if duration in (None, "") else self.catalogue.check_duration(duration)
+        return Tour(GROUP, day, start, duration, school=school, students=students)
+
+    def request_walk_in(self, day, time, requested=True, duration=None):
+        """
+        Mark the walk-in slot at `time` as requested or not, adding the slot if it is new.
+
+        New slots last the catalogue's walk-in length unless `duration` says otherwise; a `duration`
+        given for an existing slot changes its length and releases whoever was staffed on it.
+        """
+        start = parse_time(time)
+        tour = self.walk_ins.get((day, start))
+        if tour is None:
+            duration = self.catalogue.walk_in_minutes if duration is None else self.catalogue.check_duration(duration)
+            return self.add_tour(Tour(WALK_IN, day, start, duration, requested=requested))
+        if duration is not None and self.catalogue.check_duration(duration) != tour.duration:
+            # Staffed navigators were only checked as free for the old length
+            for name in list(tour.navigators):
+                self.release(tour, self.schedule.get_navigator(name))
+            tour.duration = int(duration)
+            self.pin_slot(day, start, tour.duration)
+        tour.requested = requested
+        if not requested:
+            for name in list(tour.navigators):
+                self.release(tour, self.schedule.get_navigator(name))
+        return tour
+
+    def walk_in_tours(self, day):
+        return [tour for tour in self.days.get(day, ()) if tour.kind == WALK_IN]
+
+    def group_tours(self, day):
+        return [tour for tour in self.days.get(day, ()) if tour.kind == GROUP]
+
+    def all_tours(self):
+        return [tour for tours in self.days.values() for tour in tours]
+
+    def assign_tours(self, solver="greedy", progress=None, cancel=None):
+        """
+        Staff every pending walk-in and unstaffed group tour.
+
+        The default greedy pass goes day by day. solver="optimal" solves the whole week at once
+        as a min-cost flow (needs NumPy), maximizing coverage with the most even load. That is
+        exact only while no two tour times overlap; when some do, the flow result and a greedy
+        pass are each improved with bump_into_short_tours and whichever covers more is kept.
+
+        progress(done, total) is called as tours are worked through, and the run stops early
+        once cancel.is_set() (e.g. a threading.Event). Returns False if it was cancelled.
+        """
+        if solver == "optimal":
+            from flow_solver import FlowSolver
+
+            flow = FlowSolver(self)
+            before = self.snapshot()
+            try:
+                with self.phase("flow"):
+                    finished = flow.solve(progress, cancel)
+                if finished and flow.any_conflicts:
+                    with self.phase("greedy_check"):
+                        finished = self.keep_greedy_if_better(before, cancel)
+            finally:
+                before.close()
+            if self.stats is not None:
+                self.stats.unassigned_slots += self.count_unassigned(self.all_tours())
+            return finished
+        if solver != "greedy":
+            raise ValueError(f"Unknown solver: {solver}")
+
+        walk_ins, groups = self.greedy_order()
+        done, total = 0, len(walk_ins) + len(groups)
+        for phase, tours in [("walk_in", walk_ins), ("group", groups)]:
+            with self.phase(phase):
+                for tour in tours:
+                    if cancel is not None and cancel.is_set():
+                        return False
+                    self.fill(tour)
+                    done += 1
+                    if progress is not None:
+                        progress(done, total)
+            if self.stats is not None:
+                self.stats.unassigned_slots += self.count_unassigned(tours)
+        return True
+
+    def greedy_order(self):
+        """
+        (requested walk-ins, group tours): the greedy pass staffs all walk-ins first, then group tours.
+        """
+        tours = self.all_tours()
+        return ([tour for tour in tours if tour.kind == WALK_IN and tour.requested],
+                [tour for tour in tours if tour.kind == GROUP])
+
+    def keep_greedy_if_better(self, before, cancel=None):
+        """
+        Bump both the current result and a greedy rerun from `before`, and keep whichever covers more.
+
+        Ties keep the current result. If cancelled, the assignments go back to `before` and this returns False.
+        """
+        self.bump_into_short_tours()
+        current = self.coverage_key()
+        result = self.snapshot()
+        try:
+            self.rollback(before)
+            walk_ins, groups = self.greedy_order()
+            for tour in walk_ins + groups:
+                if cancel is not None and cancel.is_set():
+                    self.rollback(before)
+                    return False
+                self.fill(tour)
+            self.bump_into_short_tours()
+            if self.coverage_key() <= current:
+                self.rollback(result)
+        finally:
+            result.close()
+        return True
+
+    def bump_into_short_tours(self):
+        """
+        Staff short tours with navigators who are booked on one clashing tour another navigator is free for.
+
+        The other navigator takes over the clashing tour and the first one moves to the short tour,
+        so every move covers one more navigator-slot, and passes repeat until none is left to make.
+        Returns how many moves were made.
+        """
+        moves = 0
+        while True:
+            made = self.bump_pass()
+            if not made:
+                return moves
+            moves += made
+
+    def bump_pass(self):
+        navigators = self.schedule.navigators
+        moves = 0
+        for tour, needed in self.short_tours():
+            end = tour.start + tour.duration
+            for navigator in navigators:
+                if len(tour.navigators) >= needed:
+                    break
+                if navigator.name in tour.navigators or not navigator.is_available(tour.day, tour.start, tour.duration):
+                    continue
+                clashes = [other for other in self.dependents.get((navigator.id, tour.day), ())
+                           if other.start < end and tour.start < other.start + other.duration]
+                if len(clashes) != 1:
+                    continue
+                other = clashes[0]
+                replacement = self.load_queue.pick(1, self.eligible_ids(other.day, other.start, other.duration))
+                if not replacement:
+                    continue
+                self.release(other, navigator)
+                self.staff(other, [navigators[replacement[0]]])
+                self.staff(tour, [navigator])
+                moves += 1
+        return moves
+
+    def coverage_key(self):
+        """
+        (navigator-slots covered, -short tours): larger is better.
+        """
+        covered = short = 0
+        for tour in self.all_tours():
+            needed = self.slot_needed(tour)
+            covered += min(len(tour.navigators), needed)
+            short += len(tour.navigators) < needed
+        return covered, -short
+
+    def phase(self, name):
+        """
+        Time a phase of a run when instrumentation is on; a no-op context otherwise.
+        """
+        return nullcontext() if self.stats is None else self.stats.phase(name)
+
+    def count_unassigned(self, tours):
+        return sum(1 for tour in tours if len(tour.navigators) < self.slot_needed(tour))
+
+    def slot_needed(self, tour):
+        if tour.kind == WALK_IN:
+            return 1 if tour.requested else 0
+        return self.policy.navigators_for(tour.students)
+
+    def short_tours(self):
+        """
+        Tours with fewer navigators than they need, as (tour, needed); partly staffed ones included.
+        """
+        short = []
+        for tour in self.all_tours():
+            needed = self.slot_needed(tour)
+            if len(tour.navigators) < needed:
+                short.append((tour, needed))
+        return short
+
+    def slot_navigators(self, tour):
+        """
+        The Navigator objects staffing a tour, resolved from the names it holds.
+        """
+        return [self.schedule.get_navigator(name) for name in tour.navigators]
+
+    def fill(self, tour):
+        """
+        Top up a tour with the least-loaded free navigators, breaking ties at random for fairness.
+
+        All the navigators still missing are picked together. If fewer are free the tour keeps
+        the ones found and shows up in short_tours().
+        """
+        missing = self.slot_needed(tour) - len(tour.navigators)
+        if missing > 0:
+            chosen = self.pick_navigators(tour.day, tour.start, missing, tour.duration)
+            if chosen:
+                self.staff(tour, chosen)
+
+    def staff(self, tour, navigators):
+        for navigator in navigators:
+            self.remember(tour, navigator)
+            navigator.assign_tour(tour.day, tour.start, tour.duration)
+            self.dependents.setdefault((navigator.id, tour.day), set()).add(tour)
+        tour.navigators = tour.navigators + [navigator.name for navigator in navigators]
+
+    def release(self, tour, navigator):
+        self.remember(tour, navigator)
+        navigator.release_tour(tour.day, tour.start)
+        self.dependents.get((navigator.id, tour.day), set()).discard(tour)
+        tour.navigators = [name for name in tour.navigators if name != navigator.name]
+
+    def remember(self, tour, navigator):
+        for snapshot in self.snapshots:
+            snapshot.saved_tours.setdefault(tour, tour.navigators)
+            snapshot.saved_counts.setdefault(navigator.id, navigator.tour_count)
+
+    def snapshot(self):
+        """
+        A Snapshot of the current assignments; close() it once it is no longer needed.
+        """
+        snapshot = Snapshot(self)
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def discard_snapshot(self, snapshot):
+        if snapshot in self.snapshots:
+            self.snapshots.remove(snapshot)
+
+    def rollback(self, snapshot):
+        """
+        Put every assignment back the way it was when `snapshot` was taken. Returns the tours changed.
+
+        Only the tours changed since then are touched. Changes go through release and staff, so
+        tour counts, the load queue, candidate lists and any other live snapshots all follow.
+        """
+        if snapshot not in self.snapshots:
+            raise ValueError("That snapshot is closed or belongs to another scheduler")
+        changed = snapshot.changed_tours()
+        navigator = self.schedule.get_navigator
+        # Free everyone first, so restoring one tour never collides with another's old staff
+        for tour in changed:
+            for name in tour.navigators:
+                if name not in snapshot.saved_tours[tour]:
+                    self.release(tour, navigator(name))
+        for tour in changed:
+            names = snapshot.saved_tours[tour]
+            self.staff(tour, [navigator(name) for name in names if name not in tour.navigators])
+            tour.navigators = names  # Restores the original order as well
+        snapshot.saved_tours.clear()
+        snapshot.saved_counts.clear()
+        return changed
+
+    def clear_assignments(self):
+        """
+        Release every navigator from every tour, e.g. to rerun a solver from scratch.
+        """
+        navigator = self.schedule.get_navigator
+        for tour in self.all_tours():
+            for name in tour.navigators:
+                self.release(tour, navigator(name))
+
+    def update_availability(self, navigator, day, times):
+        """
+        Change one navigator's availability for a day and repair only the tours it affects.
+
+        Tours the navigator can no longer cover are released and re-staffed, and unfilled tours
+        on that day get another try in case the new hours cover them. Returns the released tours.
+        """
+        navigator.set_availability(day, times)
+
+        released = [
+            tour for tour in sorted(self.dependents.get((navigator.id, day), ()), key=Tour.sort_key)
+            if not navigator.is_available(day, tour.start, tour.duration)
+        ]
+        for tour in released:
+            self.release(tour, navigator)
+
+        for tour in self.days.get(day, ()):
+            self.fill(tour)
+        return released
+
+    def pick_navigators(self, day, start, k, duration=TOUR_MINUTES):
+        """
+        Up to k of the least-loaded navigators free for the tour starting `start` minutes into the day.
+        """
+        navigators = self.schedule.navigators
+        eligible = self.eligible_ids(day, start, duration)
+        if self.stats is not None:
+            self.stats.candidates_scanned += len(eligible)
+        return [navigators[i] for i in self.load_queue.pick(k, eligible)]
+
+    def coverage_profile(self):
+        if self.coverage is None:
+            from coverage_profile import CoverageProfile
+
+            self.coverage = CoverageProfile.for_schedule(self.schedule, self.days, self.catalogue.durations)
+        return self.coverage
+
+    def recommend_times(self, day, navigators, duration=None, step=15):
+        """
+        Start times on `day` that `navigators` free navigators could staff for `duration` minutes.
+
+        Returns (time, free navigators, slack) with the most slack first; existing assignments
+        are taken into account, tours not yet staffed are not.
+        """
+        duration = self.catalogue.default_minutes if duration is None else duration
+        options = self.coverage_profile().recommend(day, navigators, duration, step)
+        return [(format_time(start), free, slack) for start, free, slack in options]
+
+    def build_index(self):
+        """
+        Build the NumPy availability bitmap once the roster is large enough to pay for it.
+        """
+        if self.index is None and len(self.schedule.navigators) >= INDEX_MIN_NAVIGATORS:
+            try:
+                from availability_index import AvailabilityIndex
+            except ImportError:  # NumPy is optional; without it the scheduler scans the roster
+                return None
+            self.index = AvailabilityIndex.for_schedule(self.schedule, self.days)
+        return self.index
+
+    def eligible_ids(self, day, start, duration=TOUR_MINUTES):
+        """
+        Ids of navigators free for the tour starting `start` minutes into the day.
+
+        Every slot asked about is tracked in `candidates` from then on, so only its first query
+        (or the first after it was evicted; slots with tours are pinned and never are) looks at the
+        roster. The returned set is live and must not be modified.
+        """
+        ids = self.candidates.get(day, start, duration)
+        if ids is not None:
+            if self.stats is not None:
+                self.stats.candidate_hits += 1
+            return ids
+        if self.stats is not None:
+            self.stats.candidate_misses += 1
+        return self.candidates.track(day, start, duration, self.scan_ids(day, start, duration))
+
+    def pin_slot(self, day, start, duration):
+        # Precompute the candidates of a slot that now has a tour and keep them out of LRU eviction
+        self.eligible_ids(day, start, duration)
+        self.candidates.pin(day, start, duration)
+
+    def scan_ids(self, day, start, duration):
+        if self.build_index() is not None:
+            ids = self.index.free_for(day, start, duration)
+            if ids is not None:
+                if self.stats is not None:
+                    self.stats.index_queries += 1
+                return set(ids.tolist())
+
+        if self.stats is not None:
+            self.stats.availability_checks += len(self.schedule.navigators)
+        return {navi.id for navi in self.schedule.navigators if navi.is_free(day, start, duration)}
+
+    def available_navigators(self, day, time, duration=TOUR_MINUTES):
+        """
+        Navigators free for the tour of `duration` minutes starting at the given time.
+        """
+        navigators = self.schedule.navigators
+        return [navigators[i] for i in sorted(self.eligible_ids(day, parse_time(time), duration))]
+
+    def is_available_for(self, navigator, day, time, duration=TOUR_MINUTES):
+        """
+        Check if the navigator's availability covers `duration` minutes from the given time.
+        """
+        return navigator.is_available(day, parse_time(time), duration)
+
+    def is_available_for_one_hour(self, navigator, day, time):
+        """
+        Check if the navigator is available for the given time and one-hour duration.
+        """
+        return self.is_available_for(navigator, day, time, 60)
+
+
+class Main:
+    def __init__(self, catalogue=None, policy=None):
+        self.schedule = Schedule()
+        self.tour_scheduler = TourScheduler(self.schedule, catalogue, policy)
+
+    def copy(self):
+        """
+        An independent copy of the whole week, so a solve can run on it without touching this one.
+        """
+        return copy.deepcopy(self)
+
+    def replace_with(self, other):
+        """
+        Take over another Main's schedule and tours, e.g. a copy that finished solving.
+        """
+        # One assignment on the caller's thread, so the GUI never sees a half-updated week
+        self.schedule, self.tour_scheduler = other.schedule, other.tour_scheduler
+
+    def add_navigator(self, name, availability):
+        if self.schedule.get_navigator(name) is not None:
+            raise ValueError(f"A navigator named {name!r} is already on the schedule")
+        navigator = Navigator(name)
+        for day, times in availability.items():
+            for start_time, end_time in times:
+                navigator.add_availability(day_name(day), start_time, end_time)
+        self.schedule.add_navigator(navigator)
+
+    def add_navigators(self, entries):
+        """
+        Add navigators from dicts like {"name": ..., "availability": {day: [[start, end], ...]}}.
+        """
+        for entry in entries:
+            self.add_navigator(entry["name"], entry.get("availability", {}))
+
+    def add_tours(self, data):
+        """
+        Load requested tours: {"walk_ins": {day: [time, ...]}, "group_tours": [{"day", "school", "time", "students"}]}.
+
+        A group tour may also give its "duration" in minutes; it must be one the catalogue allows.
+        Group tours are checked all together first: if any is invalid, none are added and the
+        ValueError lists the problems.
+        """
+        scheduler = self.tour_scheduler
+        report = scheduler.add_group_tours(data.get("group_tours", []), strict=True)
+        if report.errors:
+            shown = "; ".join(f"group tour {position + 1}: {message}" for position, message in report.errors[:10])
+            more = f" (and {len(report.errors) - 10} more)" if len(report.errors) > 10 else ""
+            raise ValueError(f"{len(report.errors)} invalid group tour(s): {shown}{more}")
+        for day, times in data.get("walk_ins", {}).items():
+            for time in times:
+                scheduler.request_walk_in(day_name(day), time)
+
+    def results(self):
+        scheduler = self.tour_scheduler
+        return {
+            "walk_ins": {
+                day: {tour.time: tour.state() for tour in scheduler.walk_in_tours(day)} for day in scheduler.days
+            },
+            "group_tours": [
+                dict(tour.as_dict(), day=tour.day, needed=scheduler.slot_needed(tour))
+                for tour in scheduler.all_tours() if tour.kind == GROUP
+            ],
+            # Requested tours left with fewer navigators than they need, whether partly staffed or not at all
+            "short_tours": [
+                {"day": tour.day, "time": tour.time, "kind": tour.kind, "school": tour.school,
+                 "needed": needed, "navigators": list(tour.navigators)}
+                for tour, needed in scheduler.short_tours()
+            ],
+            "tour_counts": {navigator.name: navigator.tour_count for navigator in self.schedule.navigators},
+        }
@@ -0,0 +1,105 @@
+"""
+Optional instrumentation for TourScheduler runs.
+
+Attach a SchedulerStats to `tour_scheduler.stats` to collect per-phase timings and hot-path
+counters; with `stats` left at None the scheduler only pays for an `is None` check per slot.
+"""
+import time
+from contextlib import contextmanager
+
+from time_utils import parse_time
+
+
+class SchedulerStats:
+    """
+    Timings and counters for one or more assign_tours runs.
+
+    Phases are "walk_in" and "group" for the greedy solver, and "flow" for the optimal one
+    plus "greedy_check" when some tour times overlap.
+    Time parses are read off parse_time's cache, so counting them costs nothing per call:
+    `time_parses` are real parses (cache misses) and `time_lookups` every call.
+
+    profile=True runs cProfile over each phase (see `profile`, a pstats.Stats), and
+    trace_memory=True records each phase's peak traced allocation in `peak_memory`.
+    """
+
+    def __init__(self, profile=False, trace_memory=False):
+        self.phase_seconds = {}
+        self.peak_memory = {}  # phase -> peak bytes allocated during it
+        self.candidates_scanned = 0  # Eligible navigators the picker chose among
+        self.availability_checks = 0  # Per-navigator interval checks on the scan path
+        self.index_queries = 0  # Slots answered from the availability bitmap instead
+        self.candidate_hits = 0  # Slots answered from their cached candidate list
+        self.candidate_misses = 0  # Slots whose candidate list had to be built first
+        self.time_parses = 0
+        self.time_lookups = 0
+        self.unassigned_slots = 0  # Slots still short of navigators after their phase
+        self.profile = None
+        self.profiling = profile
+        self.trace_memory = trace_memory
+
+    @contextmanager
+    def phase(self, name):
+        profiler = None
+        if self.profiling:
+            import cProfile
+
+            profiler = cProfile.Profile()
+        if self.trace_memory:
+            import tracemalloc
+
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        parses = parse_time.cache_info()
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + time.perf_counter() - start
+            after = parse_time.cache_info()
+            self.time_parses += after.misses - parses.misses
+            self.time_lookups += after.hits + after.misses - parses.hits - parses.misses
+
+            if profiler is not None:
+                import pstats
+
+                if self.profile is None:
+                    self.profile = pstats.Stats(profiler)
+                else:
+                    self.profile.add(profiler)
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                self.peak_memory[name] = max(self.peak_memory.get(name, 0), peak)
+                if not tracing:
+                    tracemalloc.stop()
+
+    def candidate_hit_rate(self):
+        lookups = self.candidate_hits + self.candidate_misses
+        return self.candidate_hits / lookups if lookups else None
+
+    def as_dict(self):
+        return {
+            "phase_seconds": dict(self.phase_seconds),
+            "peak_memory": dict(self.peak_memory),
+            "candidates_scanned": self.candidates_scanned,
+            "availability_checks": self.availability_checks,
+            "index_queries": self.index_queries,
+            "candidate_hits": self.candidate_hits,
+            "candidate_misses": self.candidate_misses,
+            "candidate_hit_rate": self.candidate_hit_rate(),
+            "time_parses": self.time_parses,
+            "time_lookups": self.time_lookups,
+            "unassigned_slots": self.unassigned_slots,
+        }
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.as_dict().items())
+        return f"SchedulerStats({fields})"
@@ -0,0 +1,127 @@
+"""
+Scrollable list views for the tkinter windows that stay fast however many rows there are.
+"""
+import tkinter as tk
+
+
+def wheel_step(event):
+    """
+    -1 to scroll up or 1 to scroll down, for both the Windows/macOS and the X11 wheel events.
+    """
+    if event.num == 4:
+        return -1
+    if event.num == 5:
+        return 1
+    return -1 if event.delta > 0 else 1
+
+
+def bind_mouse_wheel(window, canvas):
+    """
+    Scroll `canvas` with the mouse wheel anywhere over its contents.
+
+    The wheel events go to whichever child widget is under the pointer, so the handler has to be
+    application-wide. It is installed when the pointer enters the canvas and removed when
+    `window` is destroyed, so closed windows do not leave handlers behind.
+    """
+    def on_mouse_wheel(event):
+        canvas.yview_scroll(wheel_step(event), "units")
+
+    def install(event):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            canvas.bind_all(sequence, on_mouse_wheel)
+
+    def remove(event):
+        # Every child's <Destroy> also reaches the toplevel binding; only the window itself counts
+        if event.widget is window:
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                canvas.unbind_all(sequence)
+
+    canvas.bind("<Enter>", install)
+    window.bind("<Destroy>", remove, add="+")
+
+
+class VirtualScrollView(tk.Frame):
+    """
+    A scrolling list of fixed-height text rows that only renders what is on screen.
+
+    Rows are produced on demand by `render_row(index) -> (text, style)`, where style names an
+    entry in `styles` (keyword arguments for tk.Label). A pool of labels just big enough to fill
+    the visible area is placed over the frame and re-filled as the view scrolls, so opening or
+    scrolling the view costs the same for ten rows as for a hundred thousand.
+
+    The mouse wheel is bound on this frame and its labels only, so nothing is left behind on the
+    application when the window closes.
+    """
+
+    def __init__(self, parent, row_count, render_row, styles, row_height=26, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.row_count = row_count
+        self.render_row = render_row
+        self.styles = styles
+        self.row_height = row_height
+        self.top = 0  # Index of the first visible row
+        self.pool = []
+
+        self.body = tk.Frame(self)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.body.bind("<Configure>", lambda event: self.resize(event.height))
+        self.bind_wheel(self.body)
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self.on_mouse_wheel)  # Windows and macOS
+        widget.bind("<Button-4>", self.on_mouse_wheel)  # Linux scroll up
+        widget.bind("<Button-5>", self.on_mouse_wheel)  # Linux scroll down
+
+    def visible_rows(self):
+        return max(1, self.body.winfo_height() // self.row_height)
+
+    def resize(self, height):
+        # One spare label covers the partly visible row at the bottom
+        needed = height // self.row_height + 1
+        while len(self.pool) < needed:
+            label = tk.Label(self.body, anchor="w", justify="left")
+            self.bind_wheel(label)
+            self.pool.append(label)
+        for label in self.pool[needed:]:
+            label.destroy()
+        del self.pool[needed:]
+        self.scroll_to(self.top)
+
+    def set_row_count(self, row_count):
+        self.row_count = row_count
+        self.scroll_to(self.top)
+
+    def scroll_to(self, top):
+        self.top = max(0, min(int(top), self.row_count - self.visible_rows()))
+        self.redraw()
+
+    def redraw(self):
+        for offset, label in enumerate(self.pool):
+            index = self.top + offset
+            if index >= self.row_count:
+                label.place_forget()
+                continue
+            text, style = self.render_row(index)
+            label.configure(text=text, **self.styles[style])
+            label.place(x=0, y=offset * self.row_height, relwidth=1, height=self.row_height)
+
+        if self.row_count:
+            first = self.top / self.row_count
+            last = min(1.0, (self.top + self.visible_rows()) / self.row_count)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * self.row_count)
+        elif unit == "pages":
+            self.scroll_to(self.top + int(amount) * self.visible_rows())
+        else:
+            self.scroll_to(self.top + int(amount))
+
+    def on_mouse_wheel(self, event):
+        self.scroll_to(self.top + 3 * wheel_step(event))
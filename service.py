@@ -0,0 +1,233 @@
+"""
+Local HTTP/JSON scheduling service, so several coordinators can get assignments at the same time.
+
+    python service.py --port 8765 --workers 4
+
+POST /assign takes one week in a single JSON body:
+
+    {"navigators": [{"name": ..., "availability": {day: [[start, end], ...]}}],
+     "walk_ins": {day: [time, ...]}, "group_tours": [{"day", "school", "time", "students", "duration"}],
+     "solver": "greedy" | "optimal", "slots": {...slot catalogue, optional...},
+     "policy": {"students_per_navigator", "minimum", "maximum"} (optional)}
+
+and answers with Main.results(). Every request gets its own Schedule and TourScheduler, built and
+solved in a worker process, so requests never share state and a long solve does not hold up the
+event loop. Every day named in a request must be one of the catalogue's days, or it is answered
+400. At most --max-pending requests are accepted at once; past that the service answers 503 with
+Retry-After instead of queueing without bound. GET /health reports the load.
+service_client.py is a small client for trying it out and load testing.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from scheduler_core import Main, SlotCatalogue, StaffingPolicy, day_name
+
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_HEADER_LINES = 100
+
+
+class RequestError(Exception):
+    """
+    A request the service will not process, answered with `status` and the message.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def solve(payload):
+    """
+    Build a week from a request payload, assign it and return Main.results().
+
+    Runs in a worker process, so it only takes and returns plain JSON data.
+    """
+    slots, policy = payload.get("slots"), payload.get("policy")
+    catalogue = SlotCatalogue.from_dict(slots) if slots else SlotCatalogue()
+    check_days(payload, catalogue.days)
+    main = Main(catalogue, StaffingPolicy.from_dict(policy) if policy else None)
+    main.add_navigators(payload.get("navigators", []))
+    main.add_tours(payload)
+    main.tour_scheduler.assign_tours(solver=payload.get("solver", "greedy"))
+    return main.results()
+
+
+def check_days(payload, days):
+    """
+    ValueError naming any day in the payload the week does not run on, before anything is built.
+
+    Days are compared as day_name gives them, as Main does when adding them.
+    """
+    used = set()
+    for entry in payload.get("navigators", []):
+        used.update(entry.get("availability", {}))
+    used.update(payload.get("walk_ins", {}))
+    used.update(tour["day"] for tour in payload.get("group_tours", []))
+    unknown = sorted(repr(day) for day in used if day_name(day) not in days)
+    if unknown:
+        shown = ", ".join(unknown[:10]) + (f" and {len(unknown) - 10} more" if len(unknown) > 10 else "")
+        raise ValueError(f"Unknown day(s) {shown}; this week runs on {', '.join(days)}")
+
+
+class SchedulingService:
+    """
+    The asyncio HTTP front end: parses requests, applies backpressure and hands solves to `executor`.
+
+    `executor` is any concurrent.futures executor; by default a process pool with `workers`
+    processes, so solves run in parallel across cores.
+    """
+
+    def __init__(self, executor=None, workers=None, max_pending=64):
+        # Workers are spawned rather than forked: forked ones would inherit the open client sockets
+        # and keep connections alive after the service closed them
+        context = multiprocessing.get_context("spawn")
+        self.executor = executor or ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        self.max_pending = max_pending
+        self.pending = 0  # Requests accepted and not yet answered
+        self.served = 0
+        self.rejected = 0
+
+    async def start(self, host="127.0.0.1", port=8765):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except RequestError as error:
+                    await send(writer, error.status, {"error": str(error)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, response = await self.dispatch(method, path, body)
+                await send(writer, status, response, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"pending": self.pending, "max_pending": self.max_pending,
+                                   "served": self.served, "rejected": self.rejected}
+        if path != "/assign":
+            return HTTPStatus.NOT_FOUND, {"error": f"No such endpoint: {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST for /assign"}
+
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Too many requests in progress, try again shortly"}
+        self.pending += 1
+        try:
+            try:
+                payload = json.loads(body)
+            except ValueError as error:
+                return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {error}"}
+            if not isinstance(payload, dict):
+                return HTTPStatus.BAD_REQUEST, {"error": "The request body must be a JSON object"}
+
+            loop = asyncio.get_running_loop()
+            try:
+                results = await loop.run_in_executor(self.executor, solve, payload)
+            except KeyError as error:
+                return HTTPStatus.BAD_REQUEST, {"error": f"Missing field: {error}"}
+            except (ValueError, TypeError, AttributeError) as error:
+                return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+            except Exception as error:  # e.g. a worker process died; the service itself keeps going
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(error).__name__}: {error}"}
+            self.served += 1
+            return HTTPStatus.OK, results
+        finally:
+            self.pending -= 1
+
+
+async def read_request(reader):
+    """
+    (method, path, headers, body) for the next request on the connection, or None once it closes.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _version = line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise RequestError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many header lines")
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length < 0:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, path.split("?", 1)[0], headers, body
+
+
+async def send(writer, status, payload, keep_alive=True):
+    body = json.dumps(payload).encode()
+    head = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if status == HTTPStatus.SERVICE_UNAVAILABLE:
+        head.append("Retry-After: 1")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(host, port, workers, max_pending):
+    service = SchedulingService(workers=workers, max_pending=max_pending)
+    server = await service.start(host, port)
+    print(f"serving on http://{host}:{port} with {workers} workers", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve tour assignment over local HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Solver processes")
+    parser.add_argument("--max-pending", type=int, default=64, help="Requests in progress before answering 503")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
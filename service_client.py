@@ -0,0 +1,143 @@
+"""
+Test client for the local scheduling service.
+
+    python service_client.py --requests 2000 --concurrency 64 --navigators 50
+
+Sends seeded synthetic weeks (see benchmark.py) to POST /assign over keep-alive connections and
+prints throughput, latency percentiles and how many requests were turned away with 503. With
+--spawn it starts a service in this process first, so no separate server is needed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from benchmark import synthetic_roster, synthetic_tours
+
+
+class ServiceClient:
+    """
+    One keep-alive HTTP connection to the service.
+
+        async with ServiceClient(host, port) as client:
+            status, results = await client.request("POST", "/assign", payload)
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def __aenter__(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def request(self, method, path, payload=None):
+        """
+        (status code, decoded JSON body) for one request.
+        """
+        body = b"" if payload is None else json.dumps(payload).encode()
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+        self.writer.write(f"{head}Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        data = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        return status, json.loads(data) if data else None
+
+
+def synthetic_payload(navigators, seed=0, solver="greedy"):
+    roster = [
+        {"name": name, "availability": {day: [list(times) for times in shifts] for day, shifts in availability.items()}}
+        for name, availability in synthetic_roster(navigators, seed)
+    ]
+    return dict(synthetic_tours(navigators, seed), navigators=roster, solver=solver)
+
+
+async def load_test(host, port, payload, requests, concurrency):
+    latencies = []
+    statuses = {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        async with ServiceClient(host, port) as client:
+            for _ in remaining:
+                start = time.perf_counter()
+                status, _ = await client.request("POST", "/assign", payload)
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_second": requests / elapsed,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "statuses": statuses,
+    }
+
+
+async def run(args):
+    service = server = None
+    if args.spawn:
+        from service import SchedulingService
+
+        service = SchedulingService(workers=args.workers, max_pending=args.max_pending)
+        server = await service.start(args.host, args.port)
+    try:
+        payload = synthetic_payload(args.navigators, args.seed, args.solver)
+        async with ServiceClient(args.host, args.port) as client:
+            status, results = await client.request("POST", "/assign", payload)
+            if status != 200:
+                raise SystemExit(f"warm-up request failed with {status}: {results}")
+        report = await load_test(args.host, args.port, payload, args.requests, args.concurrency)
+        print(json.dumps(report, indent=2))
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the local scheduling service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32, help="Connections sending requests at once")
+    parser.add_argument("--navigators", type=int, default=50, help="Roster size of each request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solver", choices=["greedy", "optimal"], default="greedy")
+    parser.add_argument("--spawn", action="store_true", help="Start a service in this process to test against")
+    parser.add_argument("--workers", type=int, default=None, help="Solver processes for --spawn")
+    parser.add_argument("--max-pending", type=int, default=64, help="Backpressure limit for --spawn")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
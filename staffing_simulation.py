@@ -0,0 +1,238 @@
+"""
+Monte Carlo staffing simulation: how likely is a roster to leave tours unstaffed?
+
+    python staffing_simulation.py roster.json --scenarios 2000 --walk-in-rate 0.8 --groups-per-day 3
+
+Demand is sampled for thousands of scenarios at once: each catalogue walk-in slot is requested
+with some probability, and group tours arrive at the candidate start times as a Poisson process
+with normally distributed sizes, staffed as the scheduler's StaffingPolicy says. All scenarios are
+then staffed together with NumPy, one slot at a time in the order the greedy assign_tours pass
+fills tours (every walk-in of the week, then every group tour, each in day and start order): the
+least-loaded eligible navigators with nothing booked over the slot, ties broken at random.
+Eligibility comes from TourScheduler.eligible_ids, so tours already assigned in the loaded week
+count against the navigators staffing them. Needs NumPy.
+"""
+import argparse
+import json
+import math
+import sys
+
+import numpy as np
+
+from scheduler_core import GROUP, WALK_IN, Main, SlotCatalogue, StaffingPolicy
+from time_utils import format_time, parse_time
+
+
+# Group tours start on the half hour from 9 AM to 4 PM unless told otherwise
+DEFAULT_GROUP_TIMES = [format_time(minute) for minute in range(9 * 60, 16 * 60 + 1, 30)]
+
+
+class DemandModel:
+    """
+    How walk-in and group-tour demand is sampled for each scenario.
+    """
+
+    def __init__(self, walk_in_rate=0.8, groups_per_day=2.0, group_times=DEFAULT_GROUP_TIMES,
+                 size_mean=28.0, size_sd=8.0):
+        self.walk_in_rate = walk_in_rate
+        self.groups_per_day = groups_per_day
+        self.group_times = [parse_time(time) for time in group_times]
+        self.size_mean = size_mean
+        self.size_sd = size_sd
+
+    def size_probability(self, low, high):
+        """
+        Chance a group has between `low` and `high` students inclusive, sizes rounded to whole students.
+        """
+        if self.size_sd <= 0:
+            return float(low <= max(1, round(self.size_mean)) <= high)
+
+        def below(size):  # P(rounded size <= size), with everything under one student counted as one
+            if size < 1:
+                return 0.0
+            return 0.5 * math.erfc((self.size_mean - size - 0.5) / (self.size_sd * math.sqrt(2)))
+
+        return (1.0 if high == math.inf else below(high)) - below(low - 1)
+
+    def navigator_probabilities(self, policy):
+        """
+        [P(a group needs k navigators) for k = 0, 1, ...] under `policy`.
+        """
+        largest = max(1, math.ceil(self.size_mean + 8 * self.size_sd))
+        probabilities = [0.0] * (policy.navigators_for(largest) + 1)
+        for size in range(1, largest + 1):
+            high = math.inf if size == largest else size  # The last size takes the whole upper tail
+            probabilities[policy.navigators_for(size)] += self.size_probability(size, high)
+        return probabilities
+
+
+def simulation_slots(catalogue, model):
+    """
+    (day, start, duration, kind) for every slot demand can land on, in the order they are staffed.
+
+    That is TourScheduler.greedy_order: all the week's walk-ins first, then all its group tours.
+    """
+    walk_ins = [(day, start, catalogue.walk_in_minutes, WALK_IN)
+                for day in catalogue.days for start in sorted(catalogue.walk_in_times)]
+    groups = [(day, start, catalogue.default_minutes, GROUP)
+              for day in catalogue.days for start in sorted(model.group_times)]
+    return walk_ins + groups
+
+
+def slot_masks(slots):
+    """
+    slots x words uint64 array: bit i of a slot's row is set if the slot covers the day's i-th grid step.
+
+    The grid step divides every slot start and duration, so two slots on one day overlap exactly when
+    their masks share a bit.
+    """
+    origin = min((start for _, start, _, _ in slots), default=0)
+    step = 0
+    for _, start, duration, _ in slots:
+        step = math.gcd(step, start - origin, duration)
+    bits = max((start + duration - origin for _, start, duration, _ in slots), default=0) // max(step, 1)
+    masks = np.zeros((len(slots), max(1, -(-bits // 64))), dtype=np.uint64)
+    for column, (_, start, duration, _) in enumerate(slots):
+        for bit in range((start - origin) // step, (start + duration - origin) // step):
+            masks[column, bit // 64] |= np.uint64(1 << bit % 64)
+    return masks
+
+
+def sample_demand(slots, model, scenarios, rng, policy=None):
+    """
+    scenarios x slots array of navigators needed.
+    """
+    demand = np.zeros((scenarios, len(slots)), dtype=np.int16)
+    group_rate = model.groups_per_day / max(1, len(model.group_times))
+    probabilities = np.array(model.navigator_probabilities(policy or StaffingPolicy()))
+    probabilities /= probabilities.sum()
+    needs = np.arange(len(probabilities))
+    for column, (_, _, _, kind) in enumerate(slots):
+        if kind == WALK_IN:
+            demand[:, column] = rng.random(scenarios) < model.walk_in_rate
+        else:
+            # How many of the slot's groups need each number of navigators
+            groups = rng.multinomial(rng.poisson(group_rate, scenarios), probabilities)
+            demand[:, column] = groups @ needs
+    return demand
+
+
+def simulate(main, model=None, scenarios=1000, seed=0):
+    """
+    Staff `scenarios` sampled weeks on main's roster and summarize how often each slot falls short.
+    """
+    model = model or DemandModel()
+    scheduler = main.tour_scheduler
+    navigator_count = len(main.schedule.navigators)
+    rng = np.random.default_rng(seed)
+
+    slots = simulation_slots(scheduler.catalogue, model)
+    demand = sample_demand(slots, model, scenarios, rng, scheduler.policy)
+    shortfall = np.zeros_like(demand)
+    tours = np.zeros((scenarios, navigator_count), dtype=np.int16)  # Tours each navigator got per scenario
+    # Walk-ins are staffed across the whole week before any group tour, so bookings are kept for every
+    # day: booked[day][scenario, navigator] is a slot_masks row of the grid steps already taken
+    masks = slot_masks(slots)
+    day_index = {day: i for i, day in enumerate(scheduler.catalogue.days)}
+    booked = np.zeros((len(day_index), scenarios, navigator_count, masks.shape[1]), dtype=np.uint64)
+
+    for column, (day, start, duration, _) in enumerate(slots):
+        need = demand[:, column]
+        rows = np.flatnonzero(need)
+        if not rows.size:
+            continue
+        ids = np.fromiter(sorted(scheduler.eligible_ids(day, start, duration)), dtype=np.int64)
+        if not ids.size:
+            shortfall[rows, column] = need[rows]
+            continue
+
+        # Least-loaded free navigators first, with a random tie-break inside each tour count
+        grid = np.ix_(rows, ids)
+        day_booked, mask = booked[day_index[day]], masks[column]
+        free = ~(day_booked[grid] & mask).any(axis=2)
+        key = np.where(free, tours[grid] + rng.random((rows.size, ids.size)), np.inf)
+        k = min(int(need[rows].max()), ids.size)
+        best = np.argpartition(key, k - 1, axis=1)[:, :k] if k < ids.size else np.argsort(key, axis=1)
+        best_keys = np.take_along_axis(key, best, axis=1)
+        order = np.argsort(best_keys, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_keys = np.take_along_axis(best_keys, order, axis=1)
+
+        taken = (np.arange(k)[None, :] < need[rows, None]) & np.isfinite(best_keys)
+        row_index, rank = np.nonzero(taken)
+        scenario, navigator = rows[row_index], ids[best[row_index, rank]]
+        tours[scenario, navigator] += 1
+        day_booked[scenario, navigator] |= mask
+        shortfall[rows, column] = need[rows] - taken.sum(axis=1)
+
+    return report(slots, demand, shortfall, tours, navigator_count)
+
+
+def report(slots, demand, shortfall, tours, navigator_count):
+    short = shortfall > 0
+    max_load = tours.max(axis=1) if navigator_count else np.zeros(len(demand))
+    return {
+        "scenarios": len(demand),
+        "navigators": navigator_count,
+        "p_any_unstaffed": float(short.any(axis=1).mean()),
+        "mean_unstaffed_slots": float(short.sum(axis=1).mean()),
+        "slots": [
+            {
+                "day": day,
+                "time": format_time(start),
+                "kind": kind,
+                "mean_demand": float(demand[:, column].mean()),
+                "p_unstaffed": float(short[:, column].mean()),
+                "mean_shortfall": float(shortfall[:, column].mean()),
+            }
+            for column, (day, start, duration, kind) in enumerate(slots)
+        ],
+        "load": {
+            "mean_tours_per_navigator": float(tours.mean()) if navigator_count else 0.0,
+            "mean_max_tours": float(max_load.mean()),
+            "p95_max_tours": float(np.percentile(max_load, 95)),
+            "mean_navigators_used": float((tours > 0).sum(axis=1).mean()),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate how often a roster leaves tours unstaffed.")
+    parser.add_argument("roster", help="JSON roster: {\"navigators\": [{\"name\", \"availability\"}]}")
+    parser.add_argument("--scenarios", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--walk-in-rate", type=float, default=0.8, help="Chance each walk-in slot is requested")
+    parser.add_argument("--groups-per-day", type=float, default=2.0, help="Mean group tours per day")
+    parser.add_argument("--group-times", nargs="+", default=DEFAULT_GROUP_TIMES, help="Times group tours can start")
+    parser.add_argument("--size-mean", type=float, default=28.0, help="Mean group size")
+    parser.add_argument("--size-sd", type=float, default=8.0, help="Standard deviation of group size")
+    parser.add_argument("--slots", help="JSON slot catalogue: days, walk-in times and tour durations")
+    parser.add_argument("--students-per-navigator", type=int, default=30, help="Group size each navigator covers")
+    parser.add_argument("--min-navigators", type=int, default=1, help="Fewest navigators on a group tour")
+    parser.add_argument("--max-navigators", type=int, default=2,
+                        help="Most navigators on a group tour (0 for no limit)")
+    parser.add_argument("-o", "--output", help="Where to write the JSON report (default: stdout)")
+    args = parser.parse_args()
+
+    catalogue = None
+    if args.slots:
+        with open(args.slots) as file:
+            catalogue = SlotCatalogue.from_dict(json.load(file))
+    policy = StaffingPolicy(args.students_per_navigator, args.min_navigators, args.max_navigators or None)
+    week = Main(catalogue, policy)
+    with open(args.roster) as file:
+        roster = json.load(file)
+    week.add_navigators(roster["navigators"] if isinstance(roster, dict) else roster)
+
+    model = DemandModel(args.walk_in_rate, args.groups_per_day, args.group_times, args.size_mean, args.size_sd)
+    result = json.dumps(simulate(week, model, args.scenarios, args.seed), indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(result + "\n")
+    else:
+        print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+from datetime import datetime
+from functools import lru_cache
+
+
+TIME_FORMAT = "%I:%M %p"
+
+
+@lru_cache(maxsize=4096)
+def parse_time(time):
+    """
+    Convert a time string such as "10:00 AM" into minutes since midnight.
+    """
+    parsed = datetime.strptime(time.strip(), TIME_FORMAT)
+    return parsed.hour * 60 + parsed.minute
+
+
+def format_time(minute):
+    """
+    Format minutes since midnight the way times are entered, e.g. 600 -> "10:00 AM".
+    """
+    hour, minute = divmod(minute, 60)
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour % 24 < 12 else 'PM'}"
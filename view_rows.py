@@ -0,0 +1,83 @@
+"""
+Row models for the list views in the GUI.
+
+Each model has a `row_count` and a `render_row(index) -> (text, style)` that builds one row on
+demand, which is what scroll_view.VirtualScrollView draws from. They do not import tkinter, so
+the benchmarks can time them without a display.
+"""
+from bisect import bisect_right
+
+from scheduler_core import WALK_IN
+from time_utils import format_time
+
+
+class AvailabilityRows:
+    """
+    Each navigator's name followed by one row per day of the week's catalogue.
+    """
+
+    def __init__(self, schedule, days):
+        self.navigators = schedule.navigators
+        self.days = list(days)
+        self.rows_per_navigator = 1 + len(self.days)
+        self.row_count = len(self.navigators) * self.rows_per_navigator
+
+    def render_row(self, index):
+        navigator = self.navigators[index // self.rows_per_navigator]
+        row = index % self.rows_per_navigator
+        if row == 0:
+            return f"{navigator.name}:", "name"
+        day = self.days[row - 1]
+        starts, ends = navigator.day_intervals(day)
+        times_text = ", ".join(
+            f"{format_time(start)} to {format_time(end)}" for start, end in zip(starts, ends)
+        ) if starts else "Unavailable"
+        return f"  {day}: {times_text}", "day"
+
+
+def describe_tour(tour, needed=None):
+    if tour.kind == WALK_IN:
+        return f"{tour.time}: {tour.state() or 'Unassigned'}"
+    navigators = ", ".join(tour.navigators) if tour.navigators else "Unassigned"
+    if tour.navigators and needed is not None and len(tour.navigators) < needed:
+        navigators += f"; only {len(tour.navigators)} of {needed}"
+    return f"{tour.time}: {tour.school} with {tour.students} students (Navigators: {navigators})"
+
+
+class WeeklyTourRows:
+    """
+    For each scheduled day a header, its walk-in and group tours in time order, and a blank spacer row.
+
+    The scheduler keeps every day's tours sorted, so a row is just a lookup.
+    """
+
+    def __init__(self, tour_scheduler):
+        self.days = tour_scheduler.days
+        self.slot_needed = tour_scheduler.slot_needed
+        self.day_names = list(self.days)
+        self.day_starts = []
+        self.row_count = 0
+        for day in self.day_names:
+            self.day_starts.append(self.row_count)
+            self.row_count += len(self.days[day]) + 2
+
+    def render_row(self, index):
+        d = bisect_right(self.day_starts, index) - 1
+        day, row = self.day_names[d], index - self.day_starts[d]
+        if row == 0:
+            return f"{day}:", "day"
+        tours = self.days[day]
+        if row > len(tours):
+            return "", "tour"  # Blank line for spacing
+        tour = tours[row - 1]
+        return f"    {describe_tour(tour, self.slot_needed(tour))}", "tour"
+
+
+class TourCountRows:
+    def __init__(self, schedule):
+        self.navigators = schedule.navigators
+        self.row_count = len(self.navigators)
+
+    def render_row(self, index):
+        navigator = self.navigators[index]
+        return f"{navigator.name}: {navigator.tour_count} tours assigned", "count"